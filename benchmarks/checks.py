@@ -0,0 +1,448 @@
+"""Offline viselkedés ellenőrzések a benchmark goldenek mellé (hálózat nélkül, ideiglenes cache-sel).
+
+A goldenek a parserek kimenetét rögzítik; ezek a checkek a köré épült logikát: meccs
+véglegesség és a tartós tárolás szabályai, circuit breaker átmenetek, statisztika tár stb.
+
+    python benchmarks/checks.py             # minden check
+    python benchmarks/checks.py --only finality
+
+Kilépési kód: 0 = minden check rendben, 1 = legalább egy hibázott.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterator, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+# a cache-ek az import pillanatában nyílnak meg: a checkek ne a valódi cache-be írjanak
+os.environ["BASKET_CACHE_DIR"] = tempfile.mkdtemp(prefix="basket_checks_")
+
+import pandas as pd  # noqa: E402
+
+import cache  # noqa: E402
+import flashscore  # noqa: E402
+import health  # noqa: E402
+import http_client  # noqa: E402
+import parallel  # noqa: E402
+import stats_store  # noqa: E402
+import team_index  # noqa: E402
+
+CHECKS: Dict[str, Callable[[], None]] = {}
+
+
+def check(fn: Callable[[], None]) -> Callable[[], None]:
+    CHECKS[fn.__name__] = fn
+    return fn
+
+
+@contextmanager
+def patched(obj: Any, name: str, value: Any) -> Iterator[None]:
+    old = getattr(obj, name)
+    setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        setattr(obj, name, old)
+
+
+def expect(actual: Any, expected: Any, what: str) -> None:
+    if actual != expected:
+        raise AssertionError(f"{what}: {actual!r} (várt: {expected!r})")
+
+
+# -----------------------
+# Meccs véglegesség és a statisztikák tartós tárolása (flashscore.py, cache.py)
+# -----------------------
+TODAY = date(2026, 3, 10)
+
+
+@check
+def finality():
+    cases = [
+        ({"status": "Finished"}, True),
+        ({"status": "After Overtime"}, True),
+        ({"raw": {"status": {"description": "Final"}}}, True),
+        ({"status": "Semi-final - Finished"}, True),
+        ({"status": "Quarter-final"}, False),            # tornaszakasz, nem állapot
+        ({"raw": {"stage": "Final"}}, False),            # a "stage" kulcsot nem olvassuk
+        ({"status": "2nd Quarter"}, False),
+        ({"status": "Halftime", "date": "2026-03-01"}, False),   # régi lista, de még élő státusz
+        ({"score_text": "45 : 40"}, False),              # az eredmény önmagában nem elég
+        ({"score_text": "20:30"}, False),
+        ({"home_score": 80, "away_score": 75}, False),
+        ({"date": "2026-03-09"}, True),                  # státusz nélkül: elmúlt nap
+        ({"date": TODAY.isoformat()}, False),
+    ]
+    for m, expected in cases:
+        expect(flashscore.is_match_final(m, today=TODAY), expected, f"is_match_final({m})")
+
+
+@check
+def daily_html_status():
+    html = ('<div class="event__match"><div class="event__stage">Finished</div>'
+            '<a href="/match/m1/">Home A - Away B</a><div class="event__score">80 : 75</div></div>'
+            '<div class="event__match"><a href="/match/m2/">Home C - Away D</a>'
+            '<div class="event__time">20:30</div></div>')
+    for parser in (flashscore.parse_daily_html_matches, flashscore.parse_daily_html_matches_fast):
+        matches = parser(html)
+        expect([(m["status"], m["score_text"]) for m in matches], [("Finished", "80 : 75"), (None, "?")],
+               parser.__name__)
+        expect([flashscore.is_match_final(m) for m in matches], [True, False], parser.__name__)
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, text: str = "", data: Any = None):
+        self.text, self.content, self._data = text, text.encode(), data
+
+    def json(self) -> Any:
+        return self._data
+
+
+def _daily_expires_at(source: str, day: date) -> Any:
+    with flashscore.daily_cache._connect() as conn:
+        return conn.execute("SELECT expires_at FROM daily WHERE source = ? AND day = ?",
+                            (source, day.isoformat())).fetchone()[0]
+
+
+@check
+def past_day_without_status_is_final():
+    past = date.today() - timedelta(days=3)
+    html = '<div class="event__match"><a href="/match/p1/">Home A - Away B</a></div>'
+    feed = {"events": [{"id": "p1", "home": "Home A", "away": "Away B"}]}
+    with patched(http_client, "get", lambda url, **kw: _FakeResponse(text=html)):
+        flashscore.fetch_daily_html_matches(past)
+    with patched(http_client, "get", lambda url, **kw: _FakeResponse(data=feed)):
+        flashscore.fetch_daily_json_feed(past)
+    for source in ("html", "json"):
+        expect(_daily_expires_at(source, past), None, f"{source}: múltbeli nap státusz nélkül")
+
+
+def _stats_df() -> pd.DataFrame:
+    return flashscore.normalize_stats_df(pd.DataFrame({"Team": ["A", "B"], "Player": ["p1", "p2"],
+                                                       "PTS": [10, 12]}))
+
+
+@contextmanager
+def fake_stats_source(result, responded: bool = True) -> Iterator[List[str]]:
+    """flashscore.load_match_stats helyett: result-ot adja, és a hívott match_id-kat gyűjti.
+    responded=False: egyik forrás sem válaszolt (hálózati hiba / nyitott circuit)."""
+    calls: List[str] = []
+
+    def load(match_id, speculative=False, answered=None):
+        calls.append(match_id)
+        if responded and answered is not None:
+            answered.append("stats:json")
+        return result
+
+    with patched(flashscore, "load_match_stats", load):
+        yield calls
+
+
+def _memo_permanent(match_id: str) -> bool:
+    return cache.stats_memo._data[match_id][1] is None
+
+
+@check
+def stats_caching_follows_finality():
+    today = date.today()
+    live = {"match_id": "chk-live", "status": "3rd Quarter", "date": today.isoformat()}
+    final = {"match_id": "chk-final", "status": "Finished", "date": today.isoformat()}
+    past = {"match_id": "chk-past", "date": (today - timedelta(days=2)).isoformat()}
+    with fake_stats_source((_stats_df(), "json")) as calls:
+        for m in (live, final, past):
+            flashscore.get_match_stats(m)
+        expect(calls, ["chk-live", "chk-final", "chk-past"], "betöltések")
+        expect(_memo_permanent("chk-live"), False, "élő meccs memo TTL-je")
+        expect(flashscore.match_stats_cache.get("chk-live"), None, "élő meccs a lemezes tárban")
+        for m in (final, past):
+            expect(_memo_permanent(m["match_id"]), True, f"{m['match_id']} memo TTL-je")
+            expect(flashscore.match_stats_cache.get(m["match_id"]) is not None, True,
+                   f"{m['match_id']} a lemezes tárban")
+        # a memo nélkül a lezárt meccs a lemezről jön, újabb letöltés nélkül
+        cache.stats_memo.pop("chk-final")
+        flashscore.get_match_stats(final)
+        expect(len(calls), 3, "lezárt meccs újratöltése a lemezről")
+
+
+@check
+def missing_stats_negative_entry():
+    m = {"match_id": "chk-none", "status": "Finished"}
+    with fake_stats_source((None, None)) as calls:
+        expect(flashscore.get_match_stats(m), (None, None), "statisztika nélküli meccs")
+        flashscore.get_match_stats(m)
+        expect(calls, ["chk-none"], "negatív bejegyzés: nincs második lekérés")
+    expect(cache.stats_memo._data["chk-none"][1] is not None, True, "a negatív bejegyzés lejár")
+    expect(flashscore.match_stats_cache.get("chk-none"), None, "negatív bejegyzés a lemezen")
+
+
+@check
+def unanswered_stats_not_memoised():
+    m = {"match_id": "chk-down", "status": "Finished"}
+    with fake_stats_source((None, None), responded=False) as calls:
+        expect(flashscore.get_match_stats(m), (None, None), "elérhetetlen forrás")
+        flashscore.get_match_stats(m)
+        expect(calls, ["chk-down", "chk-down"], "hálózati hiba után újrapróbálás")
+    expect("chk-down" in cache.stats_memo._data, False, "negatív bejegyzés hálózati hibára")
+
+
+@check
+def live_refresh_keeps_source_and_stored_stats():
+    today = date.today()
+    live = {"match_id": "chk-l1", "home": "Home A", "away": "Away B", "score_text": "40 : 38",
+            "status": "2nd Quarter"}
+    done = {"match_id": "chk-l2", "home": "Home C", "away": "Away D", "score_text": "80 : 75",
+            "status": "Finished"}
+    day_list = [dict(live, score_text="52 : 50", status="3rd Quarter"), dict(done, score_text="80 - 75")]
+    json_calls: List[date] = []
+
+    def json_feed(day, max_age=None):
+        json_calls.append(day)
+        return {"events": [{"id": "other", "home": "X", "away": "Y"}]}
+
+    with fake_stats_source((_stats_df(), "html")) as calls, \
+            patched(flashscore, "fetch_daily_json_feed", json_feed), \
+            patched(flashscore, "fetch_daily_html_matches", lambda day, max_age=None: day_list):
+        flashscore.get_match_stats(dict(done, date=today.isoformat()))      # már a tartós tárban
+        updated, changed = flashscore.refresh_live_matches(today, [live, done], max_age=0, source="html")
+    expect(json_calls, [], "élő munkamenetben csak az eredeti forrás")
+    expect([m["match_id"] for m in changed], ["chk-l1", "chk-l2"], "változott meccsek")
+    expect(updated[0]["status"], "3rd Quarter", "frissített állapot")
+    expect(calls, ["chk-l2", "chk-l1"], "a tárolt lezárt meccs nem töltődik újra")
+    expect(flashscore.match_stats_cache.get("chk-l1"), None, "élő meccs nem kerül a lemezre")
+    expect(_memo_permanent("chk-l1"), False, "élő meccs memo TTL-je")
+
+
+# -----------------------
+# Circuit breaker (health.py)
+# -----------------------
+def _source(tracker: health.HealthTracker, outcomes: List[bool], result: Any = None) -> Callable[[], Any]:
+    """Forrás, ami hívásonként a note()-tal jelzi a következő hálózati kimenetelt."""
+    def fn():
+        tracker.note(outcomes.pop(0))
+        return result
+    return fn
+
+
+@check
+def health_failures_and_empty_answers():
+    tracker = health.HealthTracker(failure_threshold=3, cooldown=60)
+    empty = tracker.track("detail:json", _source(tracker, [True] * 5, result=None))
+    for _ in range(5):
+        empty()
+    expect(tracker.snapshot()[0]["failures"], 0, "válasz adat nélkül nem hiba")
+    cached = tracker.track("daily:json", lambda: ["cache találat, note() nélkül"])
+    cached()
+    expect([h["source"] for h in tracker.snapshot()], ["detail:json"], "cache találat nem rögzül")
+
+    def broken():
+        raise OSError("timeout")
+    failing = tracker.track("detail:html", broken)
+    for _ in range(3):
+        expect(failing(), None, "kivétel: None eredmény")
+    expect(tracker.is_open("detail:html"), True, "3 egymás utáni hiba után nyitott")
+    expect([name for name, _ in tracker.arrange("detail", [("json", empty), ("html", failing)])], ["json"],
+           "nyitott forrás kimarad")
+
+
+@check
+def health_half_open_single_probe():
+    tracker = health.HealthTracker(failure_threshold=1, cooldown=60)
+    outcomes = [False, True]
+    src = tracker.track("detail:html", _source(tracker, outcomes, result="ok"))
+    src()
+    expect(tracker.snapshot()[0]["circuit"], "open", "hiba után")
+    expect(src(), None, "nyitott circuit: nincs hívás")
+    tracker._stats["detail:html"].open_until = 1.0          # a cooldown letelt
+    expect(tracker.snapshot()[0]["circuit"], "half-open", "cooldown után")
+    expect(tracker._admit("detail:html"), True, "az első hívó kapja a próbát")
+    expect(tracker._admit("detail:html"), False, "a próba alatt a többi hívó kimarad")
+    expect(tracker.arrange("detail", [("html", src)]), [], "arrange a próba alatt")
+    tracker._release("detail:html")
+    expect(src(), "ok", "sikeres próba")
+    expect(tracker.snapshot()[0]["circuit"], "closed", "sikeres próba után")
+    # sikertelen próba: azonnal újra nyitott
+    tracker.record("detail:html", False, 0.1)
+    tracker._stats["detail:html"].open_until = 1.0
+    outcomes.append(False)
+    src()
+    expect(tracker.snapshot()[0]["circuit"], "open", "sikertelen próba után")
+
+
+# -----------------------
+# Történeti statisztika tár (stats_store.py)
+# -----------------------
+@check
+def stats_store_save_and_load():
+    store = stats_store.PlayerStatsStore(os.path.join(os.environ["BASKET_CACHE_DIR"], "check_store.sqlite3"))
+    m1 = {"match_id": "s1", "date": "2026-01-05", "home": "Alba Berlin", "away": "Bayern"}
+    m2 = {"match_id": "s2", "date": "2026-01-12", "home": "Bayern", "away": "Partizan"}
+    # ugyanaz a meccs előbb JSON (csapatnévvel), majd HTML forrásból (csapat nélkül): nem duplikál
+    store.save(m1, flashscore.normalize_stats_df(pd.DataFrame({
+        "Team": ["Alba Berlin", "Bayern"], "Player": ["Alba 1", "Bayern 1"], "PTS": [10, 20]})))
+    expect(store.save(m1, flashscore.normalize_stats_df(pd.DataFrame({
+        "Team": ["Alba Berlin", "Bayern"], "Player": ["Alba 1", "Bayern 1"], "PTS": [11, 21], "AST": [2, "x"]}))),
+        2, "mentett sorok")
+    store.save(m2, flashscore.normalize_stats_df(pd.DataFrame({
+        "Team": ["Bayern", "Partizan"], "Player": ["Bayern 1", "Partizan 1"], "PTS": [30, 5]})))
+    df = store.load()
+    expect(len(df), 4, "sorok száma újramentés után")
+    expect(sorted(df[df["match_id"] == "s1"]["points"].tolist()), [11, 21], "az újramentés felülír")
+    expect(str(df["points"].dtype), "Int64", "stat oszlop típusa")
+    expect(df.loc[df["player"] == "Bayern 1", "assists"].isna().all(), True, "hiányzó stat: NA")
+    # team: a játékos csapata; match_team: a meccs bármelyik csapata (ellenféllel együtt)
+    expect(sorted(store.load(team="alba")["player"].tolist()), ["Alba 1"], "team szűrés")
+    expect(sorted(store.load(match_team="alba")["player"].tolist()), ["Alba 1", "Bayern 1"], "match_team szűrés")
+    expect(len(store.load(team="bayern", since="2026-01-10")), 1, "dátum szűrés")
+    avg = stats_store.player_averages(store.load(team="bayern")).set_index("player")
+    expect((int(avg.loc["Bayern 1", "games"]), float(avg.loc["Bayern 1", "points"])), (2, 25.5), "átlagok")
+    totals = stats_store.team_totals(store.load()).set_index("team")
+    expect((int(totals.loc["Bayern", "games"]), int(totals.loc["Bayern", "points"])), (2, 51), "csapat összesítő")
+
+
+# -----------------------
+# Csapatnév index (team_index.py)
+# -----------------------
+TEAMS = [{"home": "Bayern München", "away": "Alba Berlin"}, {"home": "FC Bayern II", "away": "Ulm"},
+         {"home": "Crvena Zvezda", "away": "Partizan"}, {"home": "Fenerbahçe Beko", "away": "Anadolu Efes"}]
+
+
+@check
+def team_index_ranking():
+    alias_path = os.path.join(os.environ["BASKET_CACHE_DIR"], "check_aliases.json")
+    idx = team_index.TeamIndex(alias_path)
+    idx.add_matches(TEAMS)
+    top = lambda q: [k for k, _ in idx.search(q)][:1]  # noqa: E731
+    expect(top("MÜNCHEN"), ["bayern munchen"], "ékezet- és kisbetű-független")
+    expect(top("bayrn munchen"), ["bayern munchen"], "elgépelés")
+    expect(top("fenerbahce"), ["fenerbahce beko"], "ç -> c")
+    expect(top("zvezda"), ["crvena zvezda"], "beépített alias")
+    expect(idx.search("xyz"), [], "nincs találat")
+    expect(idx.search("bayern munchen")[0][1] > idx.search("bayrn munchen")[0][1], True,
+           "a pontos részsztring erősebb a toleráns egyezésnél")
+    # tanult alias: egy új (üres) index is látja, a fájlból betöltve
+    idx.learn("bm", "Bayern München")
+    fresh = team_index.TeamIndex(alias_path)
+    fresh.add_matches(TEAMS)
+    expect([k for k, _ in fresh.search("bm")][:1], ["bayern munchen"], "tanult alias új indexben")
+    # a flashscore szűrés relevancia szerint rendez, azonos pontszámnál az eredeti sorrendben
+    with patched(flashscore, "team_index", fresh):
+        expect([m["home"] for m in flashscore.filter_matches_by_team(TEAMS, "bayern")],
+               ["Bayern München", "FC Bayern II"], "azonos pontszám: eredeti sorrend")
+        expect([m["home"] for m in flashscore.filter_matches_by_team(TEAMS, "bayern ii")][:1],
+               ["FC Bayern II"], "a jobb egyezés elöl")
+        # min_score=SUBSTRING_SCORE (export_stats alapértelmezése): toleráns találat nélkül
+        strict = lambda q: [m["home"] for m in flashscore.filter_matches_by_team(  # noqa: E731
+            TEAMS, q, min_score=team_index.SUBSTRING_SCORE)]
+        expect(strict("bayrn munchen"), [], "szigorú szűrés: elgépelés kimarad")
+        expect(strict("zvezda"), ["Crvena Zvezda"], "szigorú szűrés: alias marad")
+
+
+# -----------------------
+# Kérés összevonás és sebességkorlát (parallel.py, http_client.py)
+# -----------------------
+@check
+def first_successful_losers_do_not_block():
+    release = threading.Event()
+
+    def loser():
+        release.wait(5)
+        return None
+
+    try:
+        start = time.monotonic()
+        # több hívás, mint amennyi szál egy közös poolban lenne: a lógó vesztesek ne éheztessenek
+        for i in range(20):
+            winner = parallel.first_successful([("slow", loser), ("fast", lambda: i)],
+                                               accept=lambda r: r is not None)
+            expect(winner, ("fast", i), "a gyors forrás nyer")
+        expect(time.monotonic() - start < 2, True, "a vesztesek nem foglalják a szálakat")
+    finally:
+        release.set()
+
+
+@check
+def single_flight_coalesces():
+    release = threading.Event()
+    runs: List[str] = []
+
+    @parallel.coalesced
+    def fetch(key):
+        runs.append(key)
+        release.wait(5)
+        if key == "bad":
+            raise OSError("down")
+        return {"key": key}
+
+    results: List[Any] = []
+
+    def call(key):
+        try:
+            results.append(fetch(key))
+        except OSError as exc:
+            results.append(exc)
+
+    threads = [threading.Thread(target=call, args=(key,)) for key in ["a"] * 4 + ["b"] + ["bad"] * 2]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)                  # mindenki a repülésben (vagy arra vár)
+    release.set()
+    for t in threads:
+        t.join(5)
+    expect(sorted(runs), ["a", "b", "bad"], "kulcsonként egy futás")
+    a_results = [r for r in results if isinstance(r, dict) and r["key"] == "a"]
+    expect(len(a_results), 4, "minden hívó megkapja az eredményt")
+    expect(len({id(r) for r in a_results}), 1, "ugyanazt az objektumot")
+    expect(sum(isinstance(r, OSError) for r in results), 2, "a kivételt minden várakozó megkapja")
+    expect(fetch("a"), {"key": "a"}, "a repülés után új hívás fut")
+    expect(runs.count("a"), 2, "a befejezett repülés nem cache")
+
+
+@check
+def token_bucket_limits_rate():
+    bucket = http_client.TokenBucket(rate=50, burst=2)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+    # 2 token azonnal, a további 3 egyenként 1/50 mp alatt töltődik
+    expect(elapsed >= 0.05, True, f"5 token {elapsed:.3f} mp alatt")
+
+
+# -----------------------
+# Futtatás
+# -----------------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline viselkedés ellenőrzések.")
+    parser.add_argument("--only", nargs="+", choices=sorted(CHECKS), default=None, help="csak ezek a checkek")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    try:
+        for name, fn in CHECKS.items():
+            if args.only and name not in args.only:
+                continue
+            try:
+                fn()
+            except Exception:
+                failed += 1
+                print(f"HIBA  {name}", file=sys.stderr)
+                traceback.print_exc()
+            else:
+                print(f"ok    {name}")
+    finally:
+        shutil.rmtree(os.environ["BASKET_CACHE_DIR"], ignore_errors=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,254 @@
+"""Anonimizált Flashscore fixture-ök a parser benchmarkhoz (benchmarks/run.py).
+
+A fixture-ök a valódi oldalak / feedek szerkezetét követik (napi JSON feed, napi HTML lista,
+meccs részletes JSON, meccs oldal stat táblával), de a csapat- és játékosnevek, azonosítók és
+eredmények determinisztikusan generáltak ("Team 001", "Player 0001"), így a repóban tárolhatók.
+
+Méretek: small / typical a fixtures/ könyvtárban van; a very large változatot a run.py futás
+közben állítja elő (ugyanezzel a generátorral), hogy ne kelljen több MB-ot a repóban tartani.
+
+    python benchmarks/make_fixtures.py          # a small / typical fixture-ök újragenerálása
+"""
+import json
+import os
+import random
+from html.entities import codepoint2name
+from typing import Dict, List
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# matches: meccsek a napi listában; players: játékosok csapatonként; noise: nem releváns elemek
+SIZES = {
+    "small": dict(matches=8, players=6, noise=20),
+    "typical": dict(matches=180, players=13, noise=400),
+    "large": dict(matches=4000, players=120, noise=8000),
+}
+STORED_SIZES = ("small", "typical")
+KINDS = {
+    "daily_json": "json",
+    "daily_html": "html",
+    "detail_json": "json",
+    "detail_html": "html",
+}
+
+CITIES = ["Győr", "München", "Beograd", "Zaragoza", "Kaunas", "Vitoria", "Pécs", "Istanbul",
+          "Málaga", "Athens", "Tel Aviv", "Szolnok", "Valencia", "Bologna", "Zagreb", "Lyon"]
+STATUSES = ["Finished", "Finished", "After Overtime", "Scheduled", "2nd Quarter", "Halftime"]
+
+
+def _team(i: int) -> str:
+    return f"{CITIES[i % len(CITIES)]} Team {i:03d}"
+
+
+def _html_name(name: str, i: int) -> str:
+    """Csapatnév HTML-ben, ahogy az oldalakon is előfordul: a sorok egy részében entitásokkal
+    (&eacute; / &#337;, &nbsp;, &amp;), hogy a parserek entitás kezelése is a goldenbe kerüljön."""
+    form = i % 4
+    if form == 1:
+        return "".join(f"&{codepoint2name[ord(c)]};" if ord(c) in codepoint2name
+                       else f"&#{ord(c)};" if ord(c) > 127 else c for c in name)
+    if form == 2:
+        return name.replace(" Team ", "&nbsp;Team ")
+    if form == 3:
+        return name.replace(" Team ", " B&amp;W Team ")
+    return name
+
+
+def _match_id(i: int) -> str:
+    return f"Mx{i:06d}"
+
+
+def _daily_rows(n: int, rng: random.Random) -> List[Dict]:
+    rows = []
+    for i in range(n):
+        status = rng.choice(STATUSES)
+        started = status != "Scheduled"
+        rows.append({
+            "id": _match_id(i),
+            "home": _team(2 * i),
+            "away": _team(2 * i + 1),
+            "home_score": rng.randint(55, 110) if started else None,
+            "away_score": rng.randint(55, 110) if started else None,
+            "status": status,
+            "league": f"League {i // 12:02d}",
+        })
+    return rows
+
+
+def daily_json(matches: int, seed: int = 1, **_) -> str:
+    """Napi feed: több előforduló eseményforma (homeTeam dict / home szöveg / competitors lista,
+    homeScore vagy score dict, slug link)."""
+    rng = random.Random(seed)
+    rows = _daily_rows(matches, rng)
+    events = []
+    for i, row in enumerate(rows):
+        form = i % 3
+        if form == 0:
+            ev = {"id": row["id"], "homeTeam": {"name": row["home"], "id": 2 * i},
+                  "awayTeam": {"name": row["away"], "id": 2 * i + 1},
+                  "homeScore": row["home_score"], "awayScore": row["away_score"]}
+        elif form == 1:
+            ev = {"matchId": row["id"], "home": row["home"], "away": row["away"],
+                  "score": {"home": row["home_score"], "away": row["away_score"]}}
+        else:
+            ev = {"intId": 900000 + i, "slug": f"/match/{row['id']}/#/match-summary",
+                  "competitors": [{"name": row["home"], "side": "home"}, {"name": row["away"], "side": "away"}],
+                  "result": {"home": row["home_score"], "away": row["away_score"]}}
+        ev.update(status=row["status"], tournament=row["league"], startTime=1700000000 + 900 * i)
+        events.append(ev)
+    payload = {"meta": {"sport": "basketball", "generated": "fixture", "count": len(events)},
+               "tournaments": sorted({row["league"] for row in rows}),
+               "events": events}
+    return json.dumps(payload, ensure_ascii=False, indent=1)
+
+
+def daily_html(matches: int, noise: int, seed: int = 1, **_) -> str:
+    """Napi oldal: liga fejlécek, meccs sorok /match/ linkkel és eredménnyel, közte script/style
+    zaj, a sorok egy része ("kiemelt" blokk) kétszer is szerepel (deduplikálás)."""
+    rng = random.Random(seed)
+    rows = _daily_rows(matches, rng)
+    out = ["<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Basketball</title>",
+           "<style>.event__match{display:flex} .event__score{font-weight:700}</style>",
+           "<script>window.environment = {\"config\": \"12:30\", \"feed\": \"f_1_0_en_1\"};</script>",
+           "</head><body><div id=\"live-table\">"]
+    # kiemelt blokk: az első néhány meccs még egyszer, más linkformával
+    out.append("<section class=\"featured\">")
+    for i, row in enumerate(rows[:max(1, matches // 20)]):
+        out.append(f"<div class=\"featured__item\"><a href=\"https://www.flashscore.com/match/{row['id']}/\">"
+                   f"{_html_name(row['home'], 2 * i)} - {_html_name(row['away'], 2 * i + 1)}</a></div>")
+    out.append("</section>")
+    league = None
+    for i, row in enumerate(rows):
+        home, away = _html_name(row["home"], 2 * i), _html_name(row["away"], 2 * i + 1)
+        if row["league"] != league:
+            league = row["league"]
+            out.append(f"<div class=\"event__header\"><span class=\"event__title\">{league}</span></div>")
+        score = (f"<div class=\"event__score\">{row['home_score']} : {row['away_score']}</div>"
+                 if row["home_score"] is not None else "<div class=\"event__time\">20:30</div>")
+        if i % 4 == 3:
+            # a link szövege üres, a csapatnevek a szülő elemben vannak
+            out.append(f"<div class=\"event__match\" id=\"g_3_{row['id']}\">"
+                       f"<a href=\"/match/{row['id']}/#/match-summary\" class=\"eventRowLink\" title=\"details\"></a>"
+                       f"<div class=\"event__participant--home\">{home}</div> – "
+                       f"<div class=\"event__participant--away\">{away}</div>{score}</div>")
+        else:
+            out.append(f"<div class=\"event__match\" id=\"g_3_{row['id']}\">"
+                       f"<div class=\"event__stage\">{row['status']}</div>"
+                       f"<a href=\"/match/{row['id']}/#/match-summary\" class=\"eventRowLink\">"
+                       f"{home} - {away}</a>{score}"
+                       f"<!-- odds {rng.randint(1, 9)}.{rng.randint(0, 99):02d} --></div>")
+    for i in range(noise):
+        out.append(f"<div class=\"banner\" data-i=\"{i}\"><a href=\"/news/{i}/\">News item {i}</a>"
+                   f"<span>{rng.randint(1, 999)} views</span></div>")
+    out.append("</div><script>var odds = {\"Mx000001\": \"88:77\"};</script></body></html>")
+    return "\n".join(out)
+
+
+def _players(team_no: int, n: int, rng: random.Random) -> List[Dict]:
+    return [{"name": f"Player {team_no * 1000 + j:04d}", "points": rng.randint(0, 35),
+             "assists": rng.randint(0, 12), "rebounds": rng.randint(0, 15), "minutes": rng.randint(0, 40)}
+            for j in range(n)]
+
+
+def detail_json(players: int, seed: int = 1, **_) -> str:
+    """Részletes feed: a játékos lista beágyazva, előtte csali listákkal; a sorok egy része
+    rövid kulcsokkal (pts/ast/reb) vagy statistics listával, néhány érték hiányzik."""
+    rng = random.Random(seed)
+    entries = []
+    for side, team_no in (("home", 1), ("away", 2)):
+        for j, p in enumerate(_players(team_no, players, rng)):
+            base = {"player": {"name": p["name"], "id": team_no * 1000 + j}}
+            form = j % 4
+            if form == 0:
+                entry = dict(base, team={"name": _team(team_no)}, points=p["points"],
+                             assists=p["assists"], rebounds=p["rebounds"])
+            elif form == 1:
+                entry = dict(base, teamName=_team(team_no), pts=p["points"], ast=p["assists"], reb=p["rebounds"])
+            elif form == 2:
+                entry = dict(base, team={"name": _team(team_no)}, statistics=[
+                    {"name": "Points", "value": p["points"]},
+                    {"name": "Assists", "value": p["assists"]},
+                    {"name": "Total Rebounds", "value": p["rebounds"]},
+                    {"name": "Minutes", "value": p["minutes"]},
+                ])
+            else:
+                # nem játszott: hiányzó statok
+                entry = dict(base, team={"name": _team(team_no)}, minutes=0)
+            entry["side"] = side
+            entries.append(entry)
+    payload = {"data": {
+        "match": {"id": _match_id(0), "home": _team(1), "away": _team(2), "status": "Finished"},
+        "incidents": [{"type": "timeout", "minute": m} for m in range(8)],
+        "summary": {"periods": [{"home": rng.randint(10, 30), "away": rng.randint(10, 30)} for _ in range(4)]},
+        "boxscore": {"playerStatistics": entries},
+    }}
+    return json.dumps(payload, ensure_ascii=False, indent=1)
+
+
+def detail_html(players: int, noise: int, seed: int = 1, **_) -> str:
+    """Meccs oldal: zaj elemek, egy nem stat táblázat (csapat összehasonlítás), majd
+    csapatonként egy box score táblázat (Player / MIN / PTS / REB / AST / FG)."""
+    rng = random.Random(seed)
+    out = ["<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Match summary</title>",
+           "<script>window.match = {\"id\": \"Mx000000\", \"score\": \"88:77\"};</script></head><body>"]
+    for i in range(noise):
+        out.append(f"<div class=\"incident\"><span class=\"time\">{i % 40}'</span>"
+                   f"<span class=\"text\">Play {i}</span></div>")
+    out.append("<table class=\"team-stats\"><tr><th>Stat</th><th>Home</th><th>Away</th></tr>")
+    for stat in ("Field goals", "3-pointers", "Free throws", "Turnovers"):
+        out.append(f"<tr><td>{stat}</td><td>{rng.randint(5, 40)}</td><td>{rng.randint(5, 40)}</td></tr>")
+    out.append("</table>")
+    for team_no in (1, 2):
+        out.append(f"<h3>{_team(team_no)}</h3><table class=\"box-score\">"
+                   "<thead><tr><th>Player</th><th>MIN</th><th>PTS</th><th>REB</th><th>AST</th><th>FG</th></tr></thead>"
+                   "<tbody>")
+        for j, p in enumerate(_players(team_no, players, rng)):
+            if j % 7 == 6:
+                out.append(f"<tr><td>{p['name']}</td><td>DNP</td><td></td><td></td><td></td><td></td></tr>")
+                continue
+            out.append(f"<tr><td>{p['name']}</td><td>{p['minutes']}</td><td>{p['points']}</td>"
+                       f"<td>{p['rebounds']}</td><td>{p['assists']}</td>"
+                       f"<td>{rng.randint(0, 12)}/{rng.randint(12, 20)}</td></tr>")
+        out.append("</tbody></table>")
+    out.append("</body></html>")
+    return "\n".join(out)
+
+
+GENERATORS = {
+    "daily_json": daily_json,
+    "daily_html": daily_html,
+    "detail_json": detail_json,
+    "detail_html": detail_html,
+}
+
+
+def fixture_path(kind: str, size: str) -> str:
+    return os.path.join(FIXTURE_DIR, f"{kind}_{size}.{KINDS[kind]}")
+
+
+def generate(kind: str, size: str) -> str:
+    return GENERATORS[kind](**SIZES[size])
+
+
+def load(kind: str, size: str) -> str:
+    """A tárolt fixture, vagy (very large / hiányzó fájl esetén) a generált változat."""
+    try:
+        with open(fixture_path(kind, size), encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return generate(kind, size)
+
+
+def main() -> int:
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for kind in GENERATORS:
+        for size in STORED_SIZES:
+            path = fixture_path(kind, size)
+            with open(path, "w", encoding="utf-8", newline="\n") as f:
+                f.write(generate(kind, size))
+            print(f"{path}: {os.path.getsize(path)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,403 @@
+"""Offline parser benchmark a tárolt / generált Flashscore fixture-ökön (lásd make_fixtures.py).
+
+Parserenként és méretenként (small / typical / large) méri:
+- a hívásonkénti időt (legjobb és medián), az áteresztőképességet (MB/s, elem/s),
+- a csúcs memóriát: a hívás alatti csúcs RSS növekményt egy külön Python folyamatban
+  (Linuxon a /proc/self/clear_refs-szel nullázott VmHWM, máshol resource.getrusage max RSS),
+  így a C könyvtárak (libxml2, pandas) foglalásai is benne vannak; Windows-on a mező üres,
+- a helyességet: a kimenet kanonikus alakjának hash-e egyezik-e a golden/ fájlban tárolttal.
+
+Ezen felül a fetch_* függvényeket végig (HTTP + parse + cache írás) lefuttatja egy helyi stub
+szerver ellen, így a teljes futás hálózat nélkül működik. A cache egy ideiglenes könyvtárba kerül.
+
+    python benchmarks/run.py                         # minden méret, táblázatos kimenet
+    python benchmarks/run.py --sizes small typical --json result.json
+    python benchmarks/run.py --baseline result.json --max-slowdown 1.3
+    python benchmarks/run.py --update-golden         # szándékos kimenetváltozás után
+
+Kilépési kód: 0 = rendben, 1 = golden eltérés vagy a baseline-hoz képest túl lassú.
+A parsereken túli logika (véglegesség, cache, circuit breaker, ...) offline ellenőrzései: checks.py.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(BENCH_DIR, "golden")
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+# a cache-ek az import pillanatában nyílnak meg: a benchmark ne a valódi cache-be írjon
+os.environ["BASKET_CACHE_DIR"] = tempfile.mkdtemp(prefix="basket_bench_")
+
+import make_fixtures  # noqa: E402
+import flashscore  # noqa: E402
+import http_client  # noqa: E402
+
+SIZES = list(make_fixtures.SIZES)
+
+# név -> (fixture fajta, parser, bemenet előkészítése)
+PARSERS: Dict[str, tuple] = {
+    "parse_matches_from_daily_json": ("daily_json", flashscore.parse_matches_from_daily_json, json.loads),
+    "parse_daily_html_matches": ("daily_html", flashscore.parse_daily_html_matches, None),
+    "parse_daily_html_matches_fast": ("daily_html", flashscore.parse_daily_html_matches_fast, None),
+    "parse_player_stats_from_match_json": ("detail_json", flashscore.parse_player_stats_from_match_json, json.loads),
+    "parse_match_stats_html": ("detail_html", flashscore.parse_match_stats_html, None),
+}
+# A két napi HTML parser kimenete azonos kell legyen, ezért közös golden fájlt használnak
+GOLDEN_NAMES = {"parse_daily_html_matches_fast": "parse_daily_html_matches"}
+
+# A stub szerveren a dátum / meccs azonosító választja ki a fixture méretét
+STUB_DAYS = {size: date(2024, 1, i + 1) for i, size in enumerate(SIZES)}
+
+
+# -----------------------
+# Kanonikus kimenet (golden összehasonlításhoz)
+# -----------------------
+def _cell(value: Any) -> Any:
+    """Típusfüggetlen cella: hiányzó ("?", None, NaN) -> None, egész szám -> int, egyéb -> str."""
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)) or value == "?":
+        return None
+    try:
+        number = float(value)
+        if number.is_integer():
+            return int(number)
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+def canonical(result: Any) -> Any:
+    """Parser kimenet -> JSON-ba írható, dtype-független alak."""
+    if result is None:
+        return None
+    if isinstance(result, pd.DataFrame):
+        return {"columns": [str(c) for c in result.columns],
+                "rows": [[_cell(v) for v in row] for row in result.astype(object).itertuples(index=False, name=None)]}
+    return [{k: _cell(v) for k, v in sorted(item.items()) if k != "raw"} for item in result]
+
+
+def digest(result: Any) -> Dict:
+    canon = canonical(result)
+    blob = json.dumps(canon, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    count = len(canon["rows"]) if isinstance(canon, dict) else len(canon or [])
+    return {"count": count, "sha256": hashlib.sha256(blob).hexdigest(),
+            "first": (canon["rows"][:1] if isinstance(canon, dict) else canon[:1]) if canon else None}
+
+
+def golden_path(name: str, size: str) -> str:
+    return os.path.join(GOLDEN_DIR, f"{GOLDEN_NAMES.get(name, name)}_{size}.json")
+
+
+def check_golden(name: str, size: str, result: Any, update: bool) -> Optional[str]:
+    """None ha egyezik (vagy most frissítettük), különben a hiba leírása."""
+    got = digest(result)
+    path = golden_path(name, size)
+    if update and name not in GOLDEN_NAMES:
+        os.makedirs(GOLDEN_DIR, exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            json.dump(got, f, ensure_ascii=False, indent=1, sort_keys=True)
+            f.write("\n")
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            want = json.load(f)
+    except OSError:
+        return f"nincs golden fájl: {os.path.relpath(path)} (--update-golden)"
+    if got["sha256"] != want.get("sha256"):
+        return (f"eltér a goldentől: {got['count']} elem (várt: {want.get('count')}), "
+                f"első: {got['first']} (várt: {want.get('first')})")
+    return None
+
+
+# -----------------------
+# Mérés
+# -----------------------
+def time_calls(fn: Callable[[], Any], min_time: float, min_runs: int = 3) -> List[float]:
+    """Ismételt hívás, amíg legalább min_time másodperc és min_runs futás össze nem jön."""
+    times: List[float] = []
+    total = 0.0
+    while len(times) < min_runs or total < min_time:
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        total += elapsed
+    return times
+
+
+def peak_rss_kib(probe: Dict) -> Optional[int]:
+    """A benchmark egyetlen hívásának csúcs RSS növekménye (KiB), friss Python folyamatban mérve
+    (lásd rss_probe), hogy a szülő korábbi foglalásai ne takarják el. None, ha nem mérhető."""
+    if sys.platform == "win32":
+        return None
+    try:
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--rss-probe", json.dumps(probe)],
+                             capture_output=True, text=True, timeout=600)
+        return int(out.stdout.split()[-1])
+    except (subprocess.SubprocessError, ValueError, IndexError):
+        return None
+
+
+def _proc_status_kib(field: str) -> Optional[int]:
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    """Linux: a VmHWM (csúcs RSS) nullázása az aktuális RSS-re."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        return _proc_status_kib("VmHWM") is not None
+    except OSError:
+        return False
+
+
+def rss_probe(probe: Dict) -> int:
+    """A gyerek folyamat oldala: a függőségek betöltése és a bemenet előkészítése után
+    a csúcs RSS változása egyetlen hívás alatt. Az ru_maxrss a folyamat teljes élettartamára
+    vonatkozik (az importok csúcsa eltakarhatja a hívásét), ezért Linuxon a VmHWM-et nullázzuk."""
+    import gc
+    import resource
+    import bs4
+    from lxml import etree
+
+    del bs4, etree  # csak betöltjük: a lusta importok ne a mérésbe számítsanak
+
+    if probe.get("base"):
+        use_stub(probe["base"])
+        http_client.get_session()
+        parser_name = FETCHERS[probe["name"]][0]
+        fn = lambda: FETCHERS[probe["name"]][2](probe["size"])  # noqa: E731
+    else:
+        parser_name = probe["name"]
+        kind, parser, prepare = PARSERS[parser_name]
+        raw = make_fixtures.load(kind, probe["size"])
+        data = prepare(raw) if prepare else raw
+        fn = lambda: parser(data)  # noqa: E731
+    # bemelegítés a small fixture-ön: a pandas / lxml első használatakor betöltött kód ne számítson
+    kind, parser, prepare = PARSERS[parser_name]
+    raw = make_fixtures.load(kind, "small")
+    parser(prepare(raw) if prepare else raw)
+    gc.collect()
+    if _reset_peak_rss():
+        before = _proc_status_kib("VmRSS")
+        fn()
+        return _proc_status_kib("VmHWM") - before
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    fn()
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss: Linuxon KiB, macOS-en bájt
+    return (after - before) // (1024 if sys.platform == "darwin" else 1)
+
+
+def measure(name: str, size: str, fn: Callable[[], Any], n_bytes: int, min_time: float,
+            probe: Dict) -> Dict:
+    result = fn()  # bemelegítés (pl. schema_memo tanulás) + a kimenet a helyesség ellenőrzéshez
+    times = time_calls(fn, min_time)
+    best = min(times)
+    items = digest(result)["count"]
+    return {
+        "name": name, "size": size, "bytes": n_bytes, "items": items, "runs": len(times),
+        "best_ms": round(best * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "mb_per_s": round(n_bytes / best / 1e6, 2) if best else None,
+        "items_per_s": round(items / best) if best else None,
+        "rss_kib": peak_rss_kib(probe),
+        "_result": result,
+    }
+
+
+def bench_parsers(sizes: List[str], only: Optional[List[str]], min_time: float) -> List[Dict]:
+    out = []
+    for size in sizes:
+        for name, (kind, parser, prepare) in PARSERS.items():
+            if only and name not in only:
+                continue
+            raw = make_fixtures.load(kind, size)
+            data = prepare(raw) if prepare else raw
+            out.append(measure(name, size, lambda: parser(data), len(raw.encode("utf-8")), min_time,
+                               probe={"name": name, "size": size}))
+    return out
+
+
+# -----------------------
+# Helyi stub szerver a fetch_* függvényekhez
+# -----------------------
+class _StubHandler(BaseHTTPRequestHandler):
+    """/x/feed/f_1_YYYYMMDD_en_1, /basketball/?d=..., /x/feed/d_1_<méret>_en_1, /match/<méret>/"""
+    pages: Dict[str, tuple] = {}
+
+    def do_GET(self):
+        path = self.path.split("#")[0]
+        hit = self.pages.get(path)
+        if hit is None:
+            self.send_error(404)
+            return
+        body, ctype = hit
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def start_stub(sizes: List[str]) -> ThreadingHTTPServer:
+    pages = {}
+    for size in sizes:
+        day = STUB_DAYS[size]
+        pages[f"/x/feed/f_1_{day.strftime('%Y%m%d')}_en_1"] = (make_fixtures.load("daily_json", size), "application/json")
+        pages[f"/basketball/?d={day.isoformat()}"] = (make_fixtures.load("daily_html", size), "text/html")
+        pages[f"/x/feed/d_1_{size}_en_1"] = (make_fixtures.load("detail_json", size), "application/json")
+        pages[f"/match/{size}/"] = (make_fixtures.load("detail_html", size), "text/html")
+    _StubHandler.pages = {k: (v.encode("utf-8"), ctype + "; charset=utf-8") for k, (v, ctype) in pages.items()}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    use_stub(f"http://127.0.0.1:{server.server_address[1]}")
+    return server
+
+
+def use_stub(base: str) -> None:
+    """A fetch_* függvények a stub szerverre mutassanak (a --rss-probe gyerek folyamat is ezt hívja)."""
+    flashscore.FEED_BASE = base + "/x/feed"
+    flashscore.WEB_BASE = base
+    # a helyi stubra nem kell a hostonkénti sebességkorlát
+    http_client._buckets[urlsplit(base).netloc] = http_client.TokenBucket(rate=1e9, burst=10 ** 9)
+
+
+# név -> (golden parser neve, fixture fajta, hívás a méret nevével)
+FETCHERS: Dict[str, tuple] = {
+    "fetch_daily_json_feed": ("parse_matches_from_daily_json", "daily_json",
+                              lambda size: flashscore.parse_matches_from_daily_json(
+                                  flashscore.fetch_daily_json_feed(STUB_DAYS[size], max_age=0))),
+    "fetch_daily_html_matches": ("parse_daily_html_matches", "daily_html",
+                                 lambda size: flashscore.fetch_daily_html_matches(STUB_DAYS[size], max_age=0)),
+    "fetch_match_json_detail": ("parse_player_stats_from_match_json", "detail_json",
+                                lambda size: flashscore.parse_player_stats_from_match_json(
+                                    flashscore.fetch_match_json_detail(size))),
+    "fetch_match_stats_by_html": ("parse_match_stats_html", "detail_html",
+                                  lambda size: flashscore.fetch_match_stats_by_html(size)),
+}
+
+
+def bench_fetchers(sizes: List[str], only: Optional[List[str]], min_time: float) -> List[Dict]:
+    """A fetch_* függvények HTTP-vel együtt; a golden a megfelelő parserével egyezik."""
+    server = start_stub(sizes)
+    base = flashscore.WEB_BASE
+    out = []
+    try:
+        for size in sizes:
+            for name, (golden, kind, call) in FETCHERS.items():
+                if only and name not in only:
+                    continue
+                n_bytes = len(make_fixtures.load(kind, size).encode("utf-8"))
+                row = measure(name, size, lambda: call(size), n_bytes, min_time,
+                              probe={"name": name, "size": size, "base": base})
+                row["golden"] = golden
+                out.append(row)
+    finally:
+        server.shutdown()
+    return out
+
+
+# -----------------------
+# Riport
+# -----------------------
+def print_table(rows: List[Dict]) -> None:
+    header = f"{'benchmark':38} {'size':8} {'KiB':>7} {'items':>6} {'best ms':>9} {'median ms':>10} " \
+             f"{'MB/s':>7} {'items/s':>9} {'RSS KiB':>9}  status"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['name']:38} {r['size']:8} {r['bytes'] / 1024:7.1f} {r['items']:6d} {r['best_ms']:9.2f} "
+              f"{r['median_ms']:10.2f} {r['mb_per_s'] or 0:7.2f} {r['items_per_s'] or 0:9d} "
+              f"{'-' if r['rss_kib'] is None else r['rss_kib']:>9}  "
+              f"{r.get('status', 'ok')}")
+
+
+def compare_baseline(rows: List[Dict], baseline_path: str, max_slowdown: float) -> List[str]:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(b["name"], b["size"]): b for b in json.load(f)["results"]}
+    problems = []
+    for r in rows:
+        b = baseline.get((r["name"], r["size"]))
+        if not b or not b.get("best_ms"):
+            continue
+        ratio = r["best_ms"] / b["best_ms"]
+        r["vs_baseline"] = round(ratio, 2)
+        if ratio > max_slowdown:
+            r["status"] = "REGRESSION"
+            problems.append(f"{r['name']} [{r['size']}]: {ratio:.2f}x lassabb a baseline-nál "
+                            f"({r['best_ms']:.2f} ms vs {b['best_ms']:.2f} ms)")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline parser benchmark Flashscore fixture-ökön.")
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=SIZES, help="fixture méretek")
+    parser.add_argument("--only", nargs="+", default=None, help="csak ezek a benchmarkok (név szerint)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="minimális mérési idő benchmarkonként (mp)")
+    parser.add_argument("--no-fetch", action="store_true", help="a stub szerveres fetch_* mérések kihagyása")
+    parser.add_argument("--json", dest="json_out", default=None, help="az eredmények mentése JSON fájlba")
+    parser.add_argument("--baseline", default=None, help="korábbi --json eredmény az összehasonlításhoz")
+    parser.add_argument("--max-slowdown", type=float, default=1.25,
+                        help="ennél nagyobb lassulás a baseline-hoz képest hibának számít")
+    parser.add_argument("--update-golden", action="store_true", help="a golden kimenetek újraírása")
+    parser.add_argument("--rss-probe", default=None, help=argparse.SUPPRESS)  # belső: peak_rss_kib gyerek folyamata
+    args = parser.parse_args(argv)
+    try:
+        if args.rss_probe:
+            print(rss_probe(json.loads(args.rss_probe)))
+            return 0
+
+        rows = bench_parsers(args.sizes, args.only, args.min_time)
+        if not args.no_fetch:
+            rows += bench_fetchers(args.sizes, args.only, args.min_time)
+
+        problems = []
+        for r in rows:
+            error = check_golden(r.get("golden", r["name"]), r["size"], r.pop("_result"),
+                                 update=args.update_golden and "golden" not in r)
+            if error:
+                r["status"] = "GOLDEN MISMATCH"
+                problems.append(f"{r['name']} [{r['size']}]: {error}")
+        if args.baseline:
+            problems += compare_baseline(rows, args.baseline, args.max_slowdown)
+
+        print_table(rows)
+        if args.json_out:
+            with open(args.json_out, "w", encoding="utf-8") as f:
+                json.dump({"python": sys.version.split()[0], "pandas": pd.__version__,
+                           "results": rows}, f, indent=1)
+        for p in problems:
+            print("HIBA:", p, file=sys.stderr)
+        return 1 if problems else 0
+    finally:
+        # az import-kori ideiglenes cache könyvtár (a --rss-probe gyerekeké is)
+        shutil.rmtree(os.environ["BASKET_CACHE_DIR"], ignore_errors=True)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,203 @@
+"""Cache rétegek.
+
+Lemezes cache a napi meccslistákhoz (SQLite, tömörített JSON), dátum + forrás kulccsal.
+
+A lejárati idő a nap "korától" függ:
+- mai nap: rövid TTL, mert az eredmények még változnak,
+- jövőbeli nap: hosszabb TTL, a program ritkán módosul,
+- múltbeli nap: ha minden meccs lezárult, a bejegyzés soha nem jár le.
+
+Lemezes meccsstatisztika tár (ugyanabban az SQLite fájlban) a lezárt meccsek táblázataihoz;
+ezt a háttér előmelegítő (prewarm.py) is tölti.
+
+Memóriabeli, méretkorlátos LRU (pl. a meccsenkénti statisztika DataFrame-ekhez), ami
+modul szinten él, így a Streamlit újrafuttatások és munkamenetek között is megmarad.
+
+A tár helye a BASKET_CACHE_DIR környezeti változó, alapértelmezés szerint a modul melletti
+.basket_cache könyvtár (nem az aktuális munkakönyvtár, így az app, a prewarm.py és az
+export_stats.py bárhonnan indítva ugyanazt a tárat használja).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+CACHE_DIR = os.environ.get("BASKET_CACHE_DIR",
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), ".basket_cache"))
+
+TODAY_TTL = 2 * 60            # mai nap: 2 perc
+FUTURE_TTL = 6 * 60 * 60      # jövőbeli nap: 6 óra
+PAST_OPEN_TTL = 15 * 60       # múltbeli nap, de van még le nem zárt meccs: 15 perc
+LIVE_STATS_TTL = 60           # még nem lezárt meccs statisztikája: 1 perc
+NO_STATS_TTL = 5 * 60         # egyik forrás sem adott statisztikát (negatív bejegyzés): 5 perc
+
+
+def ttl_for(day: date, final: bool, today: Optional[date] = None) -> Optional[int]:
+    """Visszaadja a bejegyzés élettartamát másodpercben; None = végleges (nem jár le)."""
+    today = today or date.today()
+    if day < today:
+        return None if final else PAST_OPEN_TTL
+    if day == today:
+        return TODAY_TTL
+    return FUTURE_TTL
+
+
+class _SQLiteStore:
+    """Közös alap: minden művelet saját kapcsolatot nyit, így a példány szálak között is megosztható."""
+
+    SCHEMA = ""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(CACHE_DIR, "daily.sqlite3")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(self.SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+def _pack(payload: Any) -> bytes:
+    return zlib.compress(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def _unpack(blob: bytes) -> Optional[Any]:
+    try:
+        return json.loads(zlib.decompress(blob))
+    except (zlib.error, ValueError):
+        return None
+
+
+class DailyCache(_SQLiteStore):
+    """(forrás, nap) -> JSON-szerializálható payload, SQLite fájlban tárolva."""
+
+    SCHEMA = ("CREATE TABLE IF NOT EXISTS daily ("
+              " source TEXT NOT NULL,"
+              " day TEXT NOT NULL,"
+              " payload BLOB NOT NULL,"
+              " fetched_at REAL NOT NULL,"
+              " expires_at REAL,"
+              " PRIMARY KEY (source, day))")
+
+    def get(self, source: str, day: date, max_age: Optional[float] = None) -> Optional[Any]:
+        """A még érvényes bejegyzés, vagy None ha nincs / lejárt / régebbi max_age másodpercnél."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT payload, fetched_at, expires_at FROM daily WHERE source = ? AND day = ?",
+                    (source, day.isoformat()),
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        payload, fetched_at, expires_at = row
+        now = time.time()
+        if expires_at is not None and expires_at < now:
+            return None
+        if max_age is not None and now - fetched_at > max_age:
+            return None
+        return _unpack(payload)
+
+    def put(self, source: str, day: date, payload: Any, final: bool = False) -> None:
+        """Eltárolja a payloadot; a lejárat a ttl_for() szabályai szerint."""
+        ttl = ttl_for(day, final)
+        now = time.time()
+        blob = _pack(payload)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO daily (source, day, payload, fetched_at, expires_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (source, day.isoformat(), blob, now, None if ttl is None else now + ttl),
+                )
+        except sqlite3.Error:
+            # a cache hibája soha ne akassza meg a lekérdezést
+            pass
+
+
+class MatchStatsCache(_SQLiteStore):
+    """match_id -> (statisztika tábla, forrás). Csak lezárt meccsekhez: a bejegyzések nem járnak le.
+
+    A táblát {"columns": [...], "data": [[...], ...]} alakban tároljuk (DataFrame.to_dict("split")
+    megfelelője), így a pandas importja nélkül is írható/olvasható.
+    """
+
+    SCHEMA = ("CREATE TABLE IF NOT EXISTS match_stats ("
+              " match_id TEXT PRIMARY KEY,"
+              " source TEXT,"
+              " payload BLOB NOT NULL,"
+              " fetched_at REAL NOT NULL)")
+
+    def get(self, match_id: str) -> Optional[Tuple[Dict[str, Any], Optional[str]]]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT payload, source FROM match_stats WHERE match_id = ?", (match_id,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        table = _unpack(row[0])
+        return (table, row[1]) if table is not None else None
+
+    def put(self, match_id: str, table: Dict[str, Any], source: Optional[str]) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO match_stats (match_id, source, payload, fetched_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (match_id, source, _pack(table), time.time()),
+                )
+        except sqlite3.Error:
+            pass
+
+
+class LRUCache:
+    """Szálbiztos, méretkorlátos memóriacache; bejegyzésenként opcionális TTL-lel."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = (value, None if ttl is None else time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+# match_id -> (DataFrame, forrás); lezárt meccsnél nem jár le, élő meccsnél LIVE_STATS_TTL;
+# (None, None) = nincs statisztika, NO_STATS_TTL-ig
+stats_memo = LRUCache(max_entries=256)
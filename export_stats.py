@@ -0,0 +1,177 @@
+"""Parancssoros batch export: csapatnevek + időszak -> keresés -> meccsek -> statisztikák,
+párhuzamos workerekkel, az eredményt folyamatosan (streamelve) írja CSV / JSONL / Parquet fájlba.
+
+Streamlit nélkül fut, a flashscore.py függvényeit használja:
+    python export_stats.py --team Partizan --team "Bayern" --from 2024-03-01 --to 2024-03-14 -o out.csv
+    python export_stats.py --team Szolnok --format jsonl > szolnok.jsonl
+
+A csapatnév alapértelmezés szerint csak pontos, részsztring vagy alias egyezéssel illeszkedik
+(a "Bayern" nem hozza a "Bayer Leverkusen" meccseit); a --fuzzy a toleráns keresést is engedi.
+
+A Parquet kimenethez a pyarrow csomag szükséges (nem kötelező függőség).
+A lekért napi listák és statisztikák a BASKET_CACHE_DIR könyvtárba (alapértelmezés: a modul
+melletti .basket_cache) kerülnek, így egy ismételt export a már lezárt meccseket onnan olvassa.
+"""
+import argparse
+import csv
+import json
+import logging
+import sys
+from datetime import date
+from typing import Dict, Iterator, List
+
+from flashscore import (
+    RANGE_WORKERS, PREFETCH_WORKERS,
+    filter_matches_by_team, load_matches_for_range, match_key, normalize_stats_df, prefetch_match_stats,
+)
+from stats_store import COLUMN_MAP, STAT_COLUMNS
+from team_index import SUBSTRING_SCORE
+
+log = logging.getLogger("export_stats")
+
+FIELDS = ["date", "match_id", "home", "away", "query"] + list(COLUMN_MAP.values())
+FORMATS = ("csv", "jsonl", "parquet")
+
+
+def find_matches(teams: List[str], start: date, end: date, speculative: bool = False,
+                 workers: int = RANGE_WORKERS, fuzzy: bool = False) -> List[Dict]:
+    """Az időszak összes napjának párhuzamos lekérése és szűrése a csapatnevekre.
+    Egy meccs csak egyszer szerepel (az első illeszkedő csapatnévvel a "query" mezőben).
+    fuzzy=False: csak pontos / részsztring / alias egyezés, hogy hasonló nevű csapat ne kerüljön be."""
+    min_score = 0.0 if fuzzy else SUBSTRING_SCORE
+    found: Dict = {}
+    for day, matches in load_matches_for_range(start, end, speculative=speculative,
+                                               max_workers=workers, max_days=None):
+        hits = 0
+        for team in teams:
+            for m in filter_matches_by_team(matches, team, min_score=min_score):
+                if match_key(m) not in found:
+                    found[match_key(m)] = dict(m, query=team)
+                    hits += 1
+        log.info("%s: %d meccs, %d új találat", day.isoformat(), len(matches), hits)
+    return sorted(found.values(), key=lambda m: m.get("date") or "")
+
+
+def stat_rows(matches: List[Dict], speculative: bool = False,
+              workers: int = PREFETCH_WORKERS) -> Iterator[List[Dict]]:
+    """Meccsenként a statisztika sorok (FIELDS kulcsokkal), ahogy a párhuzamos lekérések elkészülnek."""
+    for m, stats_df in prefetch_match_stats(matches, speculative=speculative, max_workers=workers):
+        if stats_df is None:
+            log.warning("nincs statisztika: %s – %s (%s)", m.get("home"), m.get("away"), m.get("match_id"))
+            continue
+        df = normalize_stats_df(stats_df).rename(columns=COLUMN_MAP)
+        # típusos tábla (category / Int16) -> Python str / int, a hiányzó érték None
+        df = df.astype(object).where(df.notna(), None)
+        base = {k: m.get(k) for k in ("date", "match_id", "home", "away", "query")}
+        yield [dict(base, **rec) for rec in df.to_dict("records")]
+
+
+class _CsvWriter:
+    def __init__(self, fh):
+        self.writer = csv.DictWriter(fh, fieldnames=FIELDS)
+        self.writer.writeheader()
+
+    def write(self, rows: List[Dict]) -> None:
+        self.writer.writerows(rows)
+
+    def close(self) -> None:
+        pass
+
+
+class _JsonlWriter:
+    def __init__(self, fh):
+        self.fh = fh
+
+    def write(self, rows: List[Dict]) -> None:
+        for row in rows:
+            self.fh.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+        self.fh.flush()
+
+    def close(self) -> None:
+        pass
+
+
+class _ParquetWriter:
+    """Meccsenként egy row group; a séma rögzített (szöveg + nullable egész oszlopok)."""
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("A Parquet kimenethez telepítsd a pyarrow csomagot (pip install pyarrow).")
+        self.pa = pa
+        self.schema = pa.schema([(f, pa.int32() if f in STAT_COLUMNS else pa.string()) for f in FIELDS])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows: List[Dict]) -> None:
+        table = self.pa.Table.from_pylist(
+            [{f: (row.get(f) if f in STAT_COLUMNS or row.get(f) is None else str(row.get(f))) for f in FIELDS}
+             for row in rows],
+            schema=self.schema)
+        self.writer.write_table(table)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def _parse_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"érvénytelen dátum (ÉÉÉÉ-HH-NN): {value}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Flashscore kosárlabda statisztikák batch exportja.")
+    parser.add_argument("--team", "-t", action="append", required=True,
+                        help="csapatnév (részleges is jó); többször megadható")
+    parser.add_argument("--from", dest="start", type=_parse_date, default=date.today(),
+                        help="első nap (ÉÉÉÉ-HH-NN), alapértelmezés: ma")
+    parser.add_argument("--to", dest="end", type=_parse_date, default=None,
+                        help="utolsó nap (ÉÉÉÉ-HH-NN), alapértelmezés: az első nap")
+    parser.add_argument("--output", "-o", default="-", help="kimeneti fájl ('-' = stdout, csak csv/jsonl)")
+    parser.add_argument("--format", "-f", choices=FORMATS, default=None,
+                        help="kimeneti formátum (alapértelmezés: a fájl kiterjesztése alapján, különben csv)")
+    parser.add_argument("--fuzzy", action="store_true",
+                        help="toleráns (elírás-tűrő) csapatnév keresés; alapból csak pontos / részleges egyezés")
+    parser.add_argument("--workers", "-w", type=int, default=PREFETCH_WORKERS, help="párhuzamos lekérések száma")
+    parser.add_argument("--speculative", action="store_true", help="JSON feed és HTML párhuzamosan (a gyorsabb nyer)")
+    parser.add_argument("--quiet", "-q", action="store_true", help="csak a hibák a stderr-re")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO,
+                        format="%(asctime)s %(levelname)s %(message)s", stream=sys.stderr)
+    fmt = args.format or next((f for f in FORMATS if args.output.endswith("." + f)), "csv")
+    if fmt == "parquet" and args.output == "-":
+        parser.error("a Parquet kimenethez fájlnevet kell megadni (--output)")
+
+    matches = find_matches(args.team, args.start, args.end or args.start,
+                           speculative=args.speculative, workers=args.workers, fuzzy=args.fuzzy)
+    if not matches:
+        log.warning("nincs a csapatnevekre illeszkedő meccs a megadott időszakban")
+        return 1
+    log.info("%d meccs, statisztikák lekérése %d workerrel...", len(matches), args.workers)
+
+    fh = None
+    if fmt == "parquet":
+        writer = _ParquetWriter(args.output)
+    else:
+        fh = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+        writer = _CsvWriter(fh) if fmt == "csv" else _JsonlWriter(fh)
+    n_rows = n_matches = 0
+    try:
+        for rows in stat_rows(matches, speculative=args.speculative, workers=args.workers):
+            writer.write(rows)
+            n_rows += len(rows)
+            n_matches += 1
+    finally:
+        writer.close()
+        if fh is not None and fh is not sys.stdout:
+            fh.close()
+    log.info("kész: %d/%d meccs, %d sor -> %s (%s)", n_matches, len(matches), n_rows, args.output, fmt)
+    return 0 if n_rows else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
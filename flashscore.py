@@ -0,0 +1,977 @@
+"""Flashscore kosárlabda scraping és feldolgozás (Streamlit nélkül is használható könyvtár).
+
+Napi meccslista: rejtett JSON feed, HTML fallback; meccs részletek: JSON feed, HTML fallback.
+A Streamlit felület (app.py), a háttér előmelegítő (prewarm.py) és a többi belépési pont
+mind ezt a modult használja.
+
+A nehéz függőségek lustán töltődnek be (gyorsabb indulás, kevesebb memória workerenként):
+a pandas csak statisztika tábla építésekor, a BeautifulSoup / lxml csak a HTML feldolgozásnál,
+a requests az első HTTP kérésnél (http_client.py).
+"""
+from __future__ import annotations
+
+from datetime import datetime, date, timedelta
+import re
+from typing import TYPE_CHECKING, Iterator, List, Dict, Optional, Tuple
+
+import http_client
+from cache import DailyCache, LIVE_STATS_TTL, MatchStatsCache, NO_STATS_TTL, stats_memo
+from health import source_health
+from metrics import metrics
+from parallel import coalesced, first_successful, map_as_completed
+from schema import find_first_list, schema_memo
+from stats_store import player_stats_store
+from team_index import normalize, team_index
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 " \
+             "(KHTML, like Gecko) Chrome/115.0 Safari/537.36"
+HEADERS = {"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"}
+# Alap URL-ek (a benchmark / tesztek helyi stub szerverre irányíthatják őket)
+FEED_BASE = "https://d.flashscore.com/x/feed"
+WEB_BASE = "https://www.flashscore.com"
+
+# Lemezes napi cache (dátum + forrás kulccsal) és a lezárt meccsek statisztika tára, lásd cache.py
+daily_cache = DailyCache()
+match_stats_cache = MatchStatsCache()
+# A fetch_* függvények @coalesced-ek: több munkamenet azonos, egyidejű lekérése egyetlen
+# HTTP kéréssé vonódik össze; a hostonkénti sebességkorlát a http_client.py-ban van.
+# A fetch_* / parse_* függvények szakaszidejét, payload méretét és cache találatait a
+# metrics.py gyűjti (@metrics.timed + metrics.note).
+
+
+# -----------------------
+# Helper: lezárult-e a meccs (a napi cache véglegességéhez)
+# -----------------------
+OPEN_STATUS_RE = re.compile(r"live|progress|quarter|half|\bq[1-4]\b|overtime|break|scheduled|not started|postponed", re.I)
+FINAL_STATUS_RE = re.compile(r"finish|\bfinal\b|ended|after|\bft\b|\baot\b", re.I)
+# tornaszakasz nevek ("Quarter-final", "Semi-finals", "1/8-final"): ezek nem a meccs állapotai
+ROUND_NAME_RE = re.compile(r"(?:quarter|semi|1/\d+)[-\s]?finals?\b|final four", re.I)
+
+
+def match_status(m: Dict) -> Optional[str]:
+    """A feed vagy az oldal státusz mezője (ha van), pl. "Finished", "Q3", "Live".
+
+    A feed "stage" kulcsa tornaszakaszt is jelenthet (pl. "Quarter-final"), ezért azt nem olvassuk.
+    """
+    raw = m.get("raw")
+    if isinstance(raw, dict):
+        for k in ("status", "statusText", "eventStage"):
+            v = raw.get(k)
+            if isinstance(v, dict):
+                v = v.get("description") or v.get("type") or v.get("name")
+            if isinstance(v, str) and v:
+                return v
+    return m.get("status")
+
+
+def is_match_final(m: Dict, today: Optional[date] = None) -> bool:
+    """A meccs akkor tekinthető lezártnak, ha a státusza ezt mondja, vagy státusz híján
+    ha a napja (a load_daily_matches "date" mezője) már elmúlt.
+
+    Az eredmény önmagában nem elég: élő meccsnél is van (pl. "45 : 40"), a HTML listában
+    pedig a kezdési időpont ("20:30") is eredménynek látszhat. Ettől függ minden végleges
+    tárolás (napi cache, statisztika memo / lemez, stats_store), ezért inkább óvatos.
+    """
+    status = ROUND_NAME_RE.sub(" ", match_status(m) or "")
+    if FINAL_STATUS_RE.search(status):
+        return True
+    if OPEN_STATUS_RE.search(status):
+        return False
+    day = m.get("date")
+    return bool(day) and str(day) < (today or date.today()).isoformat()
+
+
+def all_matches_final(matches: List[Dict], day: Optional[date] = None) -> bool:
+    """Minden meccs lezárt-e. day: a lista napja; a nyers feed/HTML meccseiben még nincs "date"
+    mező, enélkül a státusz nélküli múltbeli meccsek sosem számítanának lezártnak."""
+    if day is not None:
+        matches = [m if m.get("date") else dict(m, date=day.isoformat()) for m in matches]
+    return bool(matches) and all(is_match_final(m) for m in matches)
+
+
+# -----------------------
+# Helper: lekéri a napi JSON feedet (Flashscore rejtett feed)
+# -----------------------
+@coalesced
+@metrics.timed
+def fetch_daily_json_feed(day: date, max_age: Optional[float] = None) -> Optional[Dict]:
+    """Próbálja betölteni a Flashscore napi JSON feedjét.
+    URL pattern (feltételezett): https://d.flashscore.com/x/feed/f_1_{YYYYMMDD}_en_1
+    Ez nem hivatalos dokumentált API — ha nem elérhető, None-t ad vissza.
+    max_age: a cache-elt payload legfeljebb ennyi másodperces lehet (0 = mindig friss lekérés,
+    pl. előmelegítésnél); a friss eredmény ettől függetlenül a cache-be kerül.
+    """
+    cached = daily_cache.get("json", day, max_age=max_age)
+    if cached is not None:
+        metrics.note(cache="hit")
+        return cached
+    metrics.note(cache="miss")
+    ymd = day.strftime("%Y%m%d")
+    url = f"{FEED_BASE}/f_1_{ymd}_en_1"
+    try:
+        r = http_client.get(url, headers=HEADERS, timeout=8)
+        metrics.note(http_status=r.status_code, bytes=len(r.content))
+        source_health.note(r.status_code == 200)
+        if r.status_code == 200:
+            data = r.json()
+            if isinstance(data, dict):
+                final = all_matches_final(parse_matches_from_daily_json(data), day)
+                daily_cache.put("json", day, data, final=final)
+            return data
+    except Exception:
+        source_health.note(False)
+    return None
+
+
+# -----------------------
+# Helper: kinyerjük a meccseket a JSON-ból, ha a struktúra ismert
+# -----------------------
+DAILY_EVENT_KEYS = ["ev", "events", "eventsData", "events_by_tournament", "sport_events", "data"]
+
+
+def _search_daily_events(data: Dict):
+    """(útvonal, lista) a napi feed eseménylistájához, vagy None (lásd schema.py)."""
+    # Lehetséges helyek ahol az események lehetnek: 'ev', 'events', 'eventsData', 'sports'
+    # Próbálunk néhány feltehető kulcsot
+    for k in DAILY_EVENT_KEYS:
+        v = data.get(k)
+        if isinstance(v, list):
+            if v:
+                return (k,), v
+            break
+    # Ha nincs, keresünk minden listában, ami dict-eket tartalmaz
+    for k, val in data.items():
+        if isinstance(val, list) and val and isinstance(val[0], dict):
+            return (k,), val
+    return None
+
+
+@metrics.timed
+def parse_matches_from_daily_json(data: Dict) -> List[Dict]:
+    """Best-effort: megpróbáljuk kinyerni a meccsek listáját a napi JSON feedből.
+    Visszatérési lista: dict-ek {match_id, home, away, home_score, away_score, raw}
+    Az eseménylista helyét az első sikeres payload után megjegyezzük (schema_memo).
+    """
+    matches = []
+    candidates = schema_memo.lookup("daily_events", data,
+                                    valid=lambda v: isinstance(v, list) and bool(v),
+                                    search=_search_daily_events) or []
+
+    for item in candidates:
+        try:
+            # Többféle struktúra lehetséges, igyekszünk rugalmasan kezelni
+            # gyakori mezők: 'id' vagy 'sid' vagy 'id2', csapatok: 'home', 'away' vagy 'homeName'/'awayName'
+            mid = item.get("id") or item.get("matchId") or item.get("sid") or item.get("intId")
+            # Néhány feedben a csapatok egy 'competitors' listában vannak
+            home = item.get("homeTeam", {}).get("name") if isinstance(item.get("homeTeam"), dict) else item.get("home")
+            away = item.get("awayTeam", {}).get("name") if isinstance(item.get("awayTeam"), dict) else item.get("away")
+            # alternatív: competitors
+            if not home or not away:
+                comps = item.get("competitors") or item.get("participants") or item.get("teams")
+                if isinstance(comps, list) and len(comps) >= 2:
+                    # találjuk a home/away mezőket ha vannak
+                    try:
+                        home = comps[0].get("name") or comps[0].get("team") or comps[0].get("home")
+                        away = comps[1].get("name") or comps[1].get("team") or comps[1].get("away")
+                    except Exception:
+                        pass
+            # pontszámok
+            home_score = None
+            away_score = None
+            # gyakori hely: 'score' vagy 'homeScore'/'awayScore'
+            if "homeScore" in item or "awayScore" in item:
+                home_score = item.get("homeScore")
+                away_score = item.get("awayScore")
+            else:
+                score = item.get("score") or item.get("result")
+                if isinstance(score, dict):
+                    home_score = score.get("home")
+                    away_score = score.get("away")
+            # Ha van slug/link mező, megpróbáljuk kinyerni a flashscore ID-t
+            link = item.get("slug") or item.get("link") or item.get("url")
+            # normalize
+            if isinstance(link, str) and "/match/" in link:
+                # pl. /match/7uYgXEqb/
+                m = re.search(r"/match/([^/]+)", link)
+                if m:
+                    mid = m.group(1)
+            if home and away:
+                matches.append({
+                    "match_id": str(mid) if mid is not None else None,
+                    "home": home,
+                    "away": away,
+                    "home_score": home_score,
+                    "away_score": away_score,
+                    "raw": item
+                })
+        except Exception:
+            continue
+    return matches
+
+
+# -----------------------
+# Helper: napi HTML lista (fallback a JSON helyett)
+# -----------------------
+MATCH_ID_RE = re.compile(r"/match/([^/]+)")
+TEAMS_RE = re.compile(r"(.+?)\s+[-–]\s+(.+)")
+SCORE_RE = re.compile(r"\d+\s*:\s*\d+|\d+\s*-\s*\d+")
+TIME_RE = re.compile(r"\s*(?:[01]?\d|2[0-3]):[0-5]\d\s*")    # kezdési időpont ("20:30"), nem eredmény
+STATUS_CLASS = "event__stage"
+
+
+def _is_score(text: str) -> bool:
+    return bool(SCORE_RE.search(text)) and not TIME_RE.fullmatch(text)
+
+
+def _daily_match_from_anchor(href: str, text: str, parent_text, score: str,
+                             status: Optional[str] = None) -> Optional[Dict]:
+    """Egy /match/ linkből meccs dict; parent_text egy függvény, ami a szülő elem szövegét adja
+    (csak akkor hívjuk, ha a link szövegéből nem olvasható ki a két csapat).
+    """
+    # tipikusan "Home - Away" vagy "Home Away" lehet benne; használjunk regexet
+    # keressünk nagybetűs szócsoportokat szeparátorként '-'
+    if "-" in text:
+        parts = [p.strip() for p in text.split("-") if p.strip()]
+        if len(parts) >= 2:
+            home = parts[0]
+            away = parts[1]
+        else:
+            return None
+    else:
+        # ha nincs '-', próbáljuk parent node-ot
+        m = TEAMS_RE.search(parent_text())
+        if m:
+            home = m.group(1).strip()
+            away = m.group(2).strip()
+        else:
+            return None
+
+    # match_id kinyerése href-ből: /match/7uYgXEqb/
+    m2 = MATCH_ID_RE.search(href)
+    match_id = m2.group(1) if m2 else None
+
+    return {
+        "match_id": match_id,
+        "home": home,
+        "away": away,
+        "home_score": None,
+        "away_score": None,
+        "score_text": score,
+        "status": status
+    }
+
+
+def _dedupe_daily_matches(matches: List[Dict]) -> List[Dict]:
+    # deduplikálás: azonos home-away párosokra csak az első; ha annál (pl. kiemelt blokk)
+    # hiányzik az eredmény vagy a státusz, a későbbi előfordulásból pótoljuk
+    uniq = []
+    seen = {}
+    for m in matches:
+        key = (m.get("home","").lower(), m.get("away","").lower())
+        if key in seen:
+            first = seen[key]
+            if first.get("score_text") == "?" and m.get("score_text") != "?":
+                first["score_text"] = m.get("score_text")
+            if first.get("status") is None:
+                first["status"] = m.get("status")
+            continue
+        seen[key] = m
+        uniq.append(m)
+    return uniq
+
+
+@metrics.timed
+def parse_daily_html_matches(html: str) -> List[Dict]:
+    """A napi oldal feldolgozása teljes BeautifulSoup fával (referencia implementáció)."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+
+    matches = []
+    # Keresünk minden <a> elemet, ahol href tartalmaz '/match/'
+    for a in soup.find_all("a", href=True):
+        href = a["href"]
+        if "/match/" not in href:
+            continue
+        # A környező szövegből próbáljuk kinyerni a csapatneveket
+        text = a.get_text(separator=" ", strip=True)
+
+        # megpróbáljuk a pontszámot is kinyerni a sibling elemekből
+        score = "?"
+        status = None
+        try:
+            # keresünk score osztályokat a környezetben
+            container = a.find_parent()
+            if container:
+                sc = container.find(string=_is_score)
+                if sc:
+                    score = sc.strip()
+                st = container.find(class_=STATUS_CLASS)
+                if st:
+                    status = st.get_text(separator=" ", strip=True) or None
+        except Exception:
+            score = "?"
+
+        m = _daily_match_from_anchor(href, text, lambda: a.parent.get_text(separator=" ", strip=True),
+                                     score, status)
+        if m:
+            matches.append(m)
+    return _dedupe_daily_matches(matches)
+
+
+class _DailyHtmlTarget:
+    """lxml parser target: fa építése nélkül, egyetlen menetben gyűjti a /match/ linkeket.
+
+    Minden nyitott elemhez csak azt tároljuk, hol kezdődnek a szövegei a közös szöveglistában,
+    így a link és a szülője szövege szeletként előáll; a dokumentumfa soha nem épül fel.
+    Az lxml egy szövegcsomópontot több data() hívásban is átadhat (pl. entitásoknál:
+    "Fen", "é", "rbahce"), ezért a darabokat a következő start / end / comment hívásig
+    pufferelve fűzzük össze, és csak utána strip-eljük.
+    A BeautifulSoup-os változattal egyezően a script/style/komment szöveg a get_text-be nem,
+    de a pontszám keresésbe beleszámít. A státusz (event__stage) szövege a lezárásakor felfelé
+    öröklődik, amíg egy őse még nem kapott ilyet (= a leszármazottak közül az első).
+    """
+    HIDDEN_TEXT = ("script", "style")
+
+    def __init__(self):
+        self.strings: List[str] = []      # a dokumentum nem üres (strip-elt) szövegdarabjai sorrendben
+        self.visible: List[bool] = []     # látható-e (get_text része) az adott szövegdarab
+        self.stack: List[list] = []       # [tag, első szöveg indexe, link adatok vagy None, gyerek linkek,
+                                          #  státusz elem-e, a leszármazottak első státusza]
+        self.found: List[tuple] = []      # (sorszám, meccs dict)
+        self.seq = 0
+        self.hidden = 0
+        self.pending: List[str] = []      # az aktuális szövegcsomópont még össze nem fűzött darabjai
+
+    def _text(self, data: str, visible: bool):
+        data = data.strip()
+        if data:
+            self.strings.append(data)
+            self.visible.append(visible)
+
+    def _flush(self):
+        if self.pending:
+            self._text("".join(self.pending), not self.hidden)
+            self.pending = []
+
+    def _visible_text(self, first: int) -> str:
+        return " ".join(t for t, v in zip(self.strings[first:], self.visible[first:]) if v)
+
+    def start(self, tag, attrib):
+        self._flush()
+        href = attrib.get("href") if tag == "a" else None
+        link = None
+        if href is not None and "/match/" in href:
+            link = (self.seq, href)
+            self.seq += 1
+        if tag in self.HIDDEN_TEXT:
+            self.hidden += 1
+        is_status = STATUS_CLASS in (attrib.get("class") or "").split()
+        self.stack.append([tag, len(self.strings), link, [], is_status, None])
+
+    def data(self, data):
+        self.pending.append(data)
+
+    def comment(self, text):
+        self._flush()
+        self._text(text, False)
+
+    def end(self, tag):
+        self._flush()
+        if not self.stack:
+            return
+        tag, first, link, child_links, is_status, status = self.stack.pop()
+        if tag in self.HIDDEN_TEXT:
+            self.hidden -= 1
+        if is_status and status is None:
+            status = self._visible_text(first) or None
+        if status is not None and self.stack and self.stack[-1][5] is None:
+            self.stack[-1][5] = status
+        if link is not None and self.stack:
+            # a link szövegét most rögzítjük; a feldolgozás a szülő lezárásakor történik
+            self.stack[-1][3].append((link[0], link[1], self._visible_text(first)))
+        if child_links:
+            score = next((t for t in self.strings[first:] if _is_score(t)), "?")
+            parent_text = self._visible_text(first)
+            for seq, href, text in child_links:
+                m = _daily_match_from_anchor(href, text, lambda: parent_text, score, status)
+                if m:
+                    self.found.append((seq, m))
+
+    def close(self):
+        self._flush()
+        self.found.sort(key=lambda pair: pair[0])
+        return [m for _, m in self.found]
+
+
+@metrics.timed
+def parse_daily_html_matches_fast(html: str) -> List[Dict]:
+    """Ugyanazt adja, mint parse_daily_html_matches, de fa nélkül (lxml SAX-szerű target parser),
+    így a nagy oldalaknál jóval kevesebb CPU és memória kell.
+    """
+    from lxml import etree
+
+    parser = etree.HTMLParser(target=_DailyHtmlTarget())
+    parser.feed(html)
+    return _dedupe_daily_matches(parser.close())
+
+
+@coalesced
+@metrics.timed
+def fetch_daily_html_matches(day: date, max_age: Optional[float] = None) -> List[Dict]:
+    """Ha a JSON feed nem működik, lekérdezzük a flashscore napi oldalt és kigyűjtjük a meccseket."""
+    cached = daily_cache.get("html", day, max_age=max_age)
+    if cached is not None:
+        metrics.note(cache="hit")
+        return cached
+    metrics.note(cache="miss")
+    ymd = day.strftime("%Y-%m-%d")
+    url = f"{WEB_BASE}/basketball/?d={ymd}"
+    try:
+        r = http_client.get(url, headers=HEADERS, timeout=10)
+        metrics.note(http_status=r.status_code, bytes=len(r.content))
+        source_health.note(r.status_code == 200)
+        if r.status_code != 200:
+            return []
+        try:
+            uniq = parse_daily_html_matches_fast(r.text)
+        except Exception:
+            uniq = parse_daily_html_matches(r.text)
+        if uniq:
+            daily_cache.put("html", day, uniq, final=all_matches_final(uniq, day))
+        return uniq
+    except Exception:
+        source_health.note(False)
+        return []
+
+
+# -----------------------
+# Keresés: a felhasználó által beírt részleges név alapján szűrünk
+# -----------------------
+def filter_matches_by_team(matches: List[Dict], team_query: str, min_score: float = 0.0) -> List[Dict]:
+    """Ékezet- és kisbetű-független, toleráns keresés a team_index.py indexén keresztül.
+    A találatok relevancia szerint rendezve jönnek (azonos pontszámnál az eredeti sorrendben).
+    min_score: ennél gyengébb találat kimarad (pl. team_index.SUBSTRING_SCORE: csak pontos,
+    részsztring és alias egyezés, toleráns trigram találat nem).
+    """
+    team_index.add_matches(matches)
+    ranked = dict(team_index.search(team_query))
+    if not ranked:
+        return []
+    scored = []
+    for m in matches:
+        score = max(ranked.get(normalize(m.get("home") or ""), 0.0),
+                    ranked.get(normalize(m.get("away") or ""), 0.0))
+        if score > 0 and score >= min_score:
+            scored.append((score, m))
+    scored.sort(key=lambda pair: -pair[0])
+    return [m for _, m in scored]
+
+
+# -----------------------
+# Részletes meccs JSON feed lekérése (match részletek)
+# -----------------------
+@coalesced
+@metrics.timed
+def fetch_match_json_detail(match_id: str) -> Optional[Dict]:
+    """Próbálja a Flashscore részletes JSON feedet betölteni.
+    Feltételezett pattern: https://d.flashscore.com/x/feed/d_1_{MATCH_ID}_en_1
+    """
+    if not match_id:
+        return None
+    url = f"{FEED_BASE}/d_1_{match_id}_en_1"
+    try:
+        r = http_client.get(url, headers=HEADERS, timeout=8)
+        metrics.note(http_status=r.status_code, bytes=len(r.content))
+        source_health.note(r.status_code == 200)
+        if r.status_code == 200:
+            return r.json()
+    except Exception:
+        source_health.note(False)
+    return None
+
+
+# -----------------------
+# Statisztika tábla: egységes, típusos séma
+# -----------------------
+DISPLAY_COLS = ["Csapat (Team)", "Játékos (Player)", "Pont (Points)", "Assziszt (Assists)", "Lepattanó (Rebounds)"]
+TEXT_COLS = DISPLAY_COLS[:2]
+STAT_COLS = DISPLAY_COLS[2:]
+# Hiányzó érték a táblában <NA>; a "?" csak megjelenítéskor kerül be (render_stats)
+MISSING = "?"
+
+
+def _text_column(values: list):
+    import pandas as pd
+
+    # (az "in" / == pd.NA-val TypeError-t dobna, ezért csak str-t hasonlítunk)
+    if all(v is None or (isinstance(v, str) and v != MISSING) for v in values):
+        return pd.Categorical(values)
+    # lassabb út: nem szöveg értékek, vagy régebben tárolt tábla, ahol a hiányzó érték még "?" volt
+    s = pd.Series(values, dtype=object)
+    s = s.where(s.notna() & (s != MISSING))
+    return s.map(str, na_action="ignore").astype("category")
+
+
+def _stat_column(values: list):
+    import pandas as pd
+
+    try:
+        # gyors út: egész számok / None (a JSON feed és a legtöbb HTML tábla ilyen)
+        return pd.array(values, dtype="Int16")
+    except (TypeError, ValueError, OverflowError):
+        nums = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+        return nums.where(nums.abs() < 2 ** 15).round().astype("Int16")
+
+
+def build_stats_frame(columns: Dict[str, list], n_rows: Optional[int] = None) -> pd.DataFrame:
+    """Oszloponként gyűjtött értékekből (DISPLAY_COLS kulcsokkal) típusos DataFrame:
+    csapat / játékos: category, statok: Int16 (nullable). A hiányzó oszlop csupa <NA>."""
+    import pandas as pd
+
+    n = n_rows if n_rows is not None else max((len(v) for v in columns.values()), default=0)
+    data = {}
+    for col in DISPLAY_COLS:
+        values = columns.get(col)
+        if values is None:
+            values = [None] * n
+        data[col] = _text_column(values) if col in TEXT_COLS else _stat_column(values)
+    return pd.DataFrame(data)
+
+
+def has_stats_schema(df: pd.DataFrame) -> bool:
+    return list(df.columns) == DISPLAY_COLS and \
+        [str(t) for t in df.dtypes] == ["category"] * len(TEXT_COLS) + ["Int16"] * len(STAT_COLS)
+
+
+def render_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """Megjelenítéshez: a hiányzó értékek helyén "?" (csak a kirajzolt másolatban)."""
+    return df.astype(object).where(df.notna(), MISSING)
+
+
+# -----------------------
+# JSON részletes adatból stat kinyerése (best-effort)
+# -----------------------
+def is_player_list(obj) -> bool:
+    return isinstance(obj, list) and bool(obj) and isinstance(obj[0], dict) and "player" in obj[0]
+
+
+@metrics.timed
+def parse_player_stats_from_match_json(data: Dict) -> Optional[pd.DataFrame]:
+    """Best-effort kinyerés a részletes match JSON-ból.
+    Visszatér típusos DataFrame-el (build_stats_frame), aminek magyar+angol címei lesznek.
+    """
+    try:
+        # Keresünk kulcsokat, ahol előfordulhatnak player statok: 'playerStatistics', 'players', 'statistics'
+        # először a korábban bevált útvonalon, különben az első lista, aminek elemei dict-ek 'player' kulccsal
+        plist = schema_memo.lookup("detail_players", data, valid=is_player_list,
+                                   search=lambda d: find_first_list(d, is_player_list))
+        if plist is None:
+            # alternatív: keresünk 'teamStatistics' -> 'players'
+            if isinstance(data, dict):
+                for k, v in data.items():
+                    if isinstance(v, dict) and "players" in v:
+                        plist = v.get("players")
+                        break
+
+        if not plist:
+            return None
+
+        columns: Dict[str, list] = {col: [] for col in DISPLAY_COLS}
+        for p in plist:
+            try:
+                player = p.get("player", {})
+                name = player.get("name") or player.get("fullName") or player.get("displayName")
+                team = p.get("team", {}).get("name") or p.get("teamName") or p.get("team")
+                # mezők: points, assists, rebounds, minutes stb.
+                pts = p.get("points") if "points" in p else p.get("pts") or p.get("scored")
+                ast = p.get("assists") if "assists" in p else p.get("ast")
+                reb = p.get("rebounds") if "rebounds" in p else p.get("reb")
+                # Ha nincsenek explicit mezők, nézzük statlist-et
+                if pts is None and p.get("statistics"):
+                    for stat in p.get("statistics"):
+                        k = stat.get("name","").lower()
+                        if "points" in k or "pts" in k:
+                            pts = stat.get("value")
+                        if "assist" in k:
+                            ast = stat.get("value")
+                        if "reb" in k:
+                            reb = stat.get("value")
+                for col, value in zip(DISPLAY_COLS, (team or None, name or None, pts, ast, reb)):
+                    columns[col].append(value)
+            except Exception:
+                continue
+
+        if not columns["Játékos (Player)"]:
+            return None
+
+        return build_stats_frame(columns)
+    except Exception:
+        return None
+
+
+# -----------------------
+# HTML scraping a meccs oldalról (fallback)
+# -----------------------
+@metrics.timed
+def parse_match_stats_html(html: str) -> Optional[pd.DataFrame]:
+    """A meccs oldal HTML-jéből a player stat tábla (típusos, DISPLAY_COLS oszlopokkal), vagy None."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+
+    # Flashscore oldalakon a stat táblák lehetnek <table> elemek, keressük a "PTS", "AST", "REB" fejléceket.
+    tables = soup.find_all("table")
+    candidate = None
+    for table in tables:
+        headers = [th.get_text(strip=True).upper() for th in table.find_all("th")]
+        # ha van PTS vagy POINTS a headerek között --> valószínű stat tábla
+        if any(h in ("PTS", "POINTS", "P") for h in headers):
+            candidate = table
+            break
+
+    if candidate is None:
+        # esetleg keresünk div-ekben stat sorokat
+        # fallback: nézzünk meg minden szöveget, és próbáljunk név + szám párokat kigyűjteni
+        # ez nagyon kevésbé megbízható, ezért egyelőre nem használjuk
+        return None
+
+    # a már feldolgozott táblából közvetlenül építjük a DataFrame-et (nincs str() + pd.read_html újra-parse)
+    try:
+        header: Optional[List[str]] = None
+        body: List[List[str]] = []
+        for tr in candidate.find_all("tr"):
+            cells = tr.find_all(["th", "td"])
+            if not cells:
+                continue
+            texts = [c.get_text(" ", strip=True) for c in cells]
+            if header is None and all(c.name == "th" for c in cells):
+                header = texts
+            else:
+                body.append(texts)
+        if not header or not body:
+            return None
+        columns = {}
+        for i, col in enumerate(stats_column_map(header)):
+            if col is not None:
+                columns[col] = [row[i] if i < len(row) and row[i] != "" else None for row in body]
+        if "Játékos (Player)" not in columns:
+            return None
+        return build_stats_frame(columns)
+    except Exception:
+        return None
+
+
+def stats_column_map(header: List[str]) -> List[Optional[str]]:
+    """Fejléc cellák -> DISPLAY_COLS oszlop (vagy None, ha nem kell); azonos oszlopnál az utolsó nyer."""
+    mapped: List[Optional[str]] = []
+    for c in header:
+        cname = str(c).lower()
+        col = None
+        if "player" in cname or "name" in cname or "jug" in cname:
+            col = "Játékos (Player)"
+        if "pts" in cname or "points" in cname or cname == "p" or re.search(r"\bpt\b", cname):
+            col = "Pont (Points)"
+        if "ast" in cname or "assists" in cname:
+            col = "Assziszt (Assists)"
+        if "reb" in cname or "rbs" in cname or "rebound" in cname:
+            col = "Lepattanó (Rebounds)"
+        mapped.append(col)
+    # ha egy oszlopnév többször illeszkedik, csak az utolsó előfordulás marad
+    seen = set()
+    for i in range(len(mapped) - 1, -1, -1):
+        if mapped[i] in seen:
+            mapped[i] = None
+        elif mapped[i] is not None:
+            seen.add(mapped[i])
+    return mapped
+
+
+@coalesced
+@metrics.timed
+def fetch_match_stats_by_html(match_id: str) -> Optional[pd.DataFrame]:
+    """Best-effort: lekéri a flashscore match oldalát és kigyűjti a player stat táblákat."""
+    if not match_id:
+        return None
+    url = f"{WEB_BASE}/match/{match_id}/#/match-summary"
+    try:
+        r = http_client.get(url, headers=HEADERS, timeout=10)
+        metrics.note(http_status=r.status_code, bytes=len(r.content))
+        source_health.note(r.status_code == 200)
+        if r.status_code != 200:
+            return None
+        return parse_match_stats_html(r.text)
+    except Exception:
+        source_health.note(False)
+        return None
+
+
+# -----------------------
+# Lekérési folyamat: JSON és HTML forrás sorban (fallback) vagy párhuzamosan (spekulatív)
+# -----------------------
+SOURCE_LABELS = {"json": "JSON feed", "html": "HTML scrape"}
+
+
+def run_sources(kind: str, sources, accept=bool, speculative: bool = False,
+                answered: Optional[List[str]] = None) -> Tuple[Optional[str], object]:
+    """A (név, függvény) források futtatása a megfigyelt állapotuk alapján (lásd health.py):
+    a nyitott circuit-ű forrásokat kihagyjuk, a többit a várhatóan leggyorsabbal kezdjük.
+    Az accept csak a nyertest választja ki; a forrás állapotába a fetch_* függvények
+    source_health.note() jelzései számítanak (üres eredmény nem hiba).
+    answered: lásd HealthTracker.track (a hibátlanul válaszoló források kulcsai).
+    Visszatér: (nyertes forrás neve, eredmény) vagy (None, None).
+    """
+    tasks = [(name, source_health.track(f"{kind}:{name}", fn, answered)) for name, fn in sources]
+    tasks = source_health.arrange(kind, tasks)
+    if speculative:
+        name, result = first_successful(tasks, accept=accept)
+        metrics.record_source(kind, name)
+        return name, result
+    for name, fn in tasks:
+        result = fn()
+        if accept(result):
+            metrics.record_source(kind, name)
+            return name, result
+    metrics.record_source(kind, None)
+    return None, None
+
+
+def load_daily_matches(day: date, speculative: bool = False, max_age: Optional[float] = None,
+                       only: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """Napi meccslista: (meccsek, nyertes forrás neve) — a forrás "json" vagy "html", vagy None.
+    Spekulatív módban mindkét forrás egyszerre indul, és az első nem üres lista nyer.
+    only: csak ez a forrás ("json" / "html"), pl. az élő frissítésnél, hogy a lista
+    (és vele a match_key-ek) ne váltson formát két frissítés között.
+    """
+    def from_json():
+        data = fetch_daily_json_feed(day, max_age=max_age)
+        return parse_matches_from_daily_json(data) if data else []
+
+    def from_html():
+        return fetch_daily_html_matches(day, max_age=max_age)
+
+    sources = [(name, fn) for name, fn in (("json", from_json), ("html", from_html)) if only in (None, name)]
+    source, matches = run_sources("daily", sources, speculative=speculative)
+    # minden meccs kap egy "date" mezőt (ISO), így a több napos lista és a statisztika tár is látja a napot
+    return [dict(m, date=day.isoformat()) for m in matches or []], source
+
+
+def load_match_stats(match_id: Optional[str], speculative: bool = False,
+                     answered: Optional[List[str]] = None) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """Játékosstatisztika egy meccshez: (DataFrame vagy None, nyertes forrás neve).
+    answered: ide kerülnek a hibátlanul (200-zal) válaszoló források (lásd run_sources)."""
+    def from_json():
+        detail = fetch_match_json_detail(match_id)
+        return parse_player_stats_from_match_json(detail) if detail else None
+
+    def from_html():
+        return fetch_match_stats_by_html(match_id)
+
+    if not match_id:
+        return None, None
+    source, stats_df = run_sources("detail", [("json", from_json), ("html", from_html)],
+                                   accept=lambda df: df is not None, speculative=speculative,
+                                   answered=answered)
+    return stats_df, source
+
+
+# -----------------------
+# Több napos (időszak) keresés: a napokat párhuzamosan, korlátos worker poollal kérjük le
+# -----------------------
+MAX_RANGE_DAYS = 31
+RANGE_WORKERS = 4
+
+
+def load_matches_for_range(start: date, end: date, speculative: bool = False,
+                           max_workers: int = RANGE_WORKERS,
+                           max_days: Optional[int] = MAX_RANGE_DAYS) -> Iterator[Tuple[date, List[Dict]]]:
+    """(nap, meccsek) párokat ad vissza abban a sorrendben, ahogy az egyes napok elkészülnek.
+    A meccsek "date" mezője (load_daily_matches) az összefésült listában is mutatja a napot.
+    max_days=None: nincs felső korlát a napok számára (batch export).
+    """
+    if end < start:
+        start, end = end, start
+    n_days = (end - start).days + 1
+    if max_days is not None:
+        n_days = min(n_days, max_days)
+    days = [start + timedelta(days=i) for i in range(n_days)]
+
+    def load_day(day: date) -> List[Dict]:
+        return load_daily_matches(day, speculative=speculative)[0]
+
+    for day, matches in map_as_completed(load_day, days, max_workers=max_workers):
+        yield day, matches or []
+
+
+# -----------------------
+# Statisztika: meccsenkénti memo + párhuzamos előtöltés az összes találatra
+# -----------------------
+PREFETCH_WORKERS = 4
+
+
+@metrics.timed
+def get_match_stats(match: Dict, speculative: bool = False, refresh: bool = False) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """load_match_stats a folyamat szintű memón (cache.stats_memo) és a lemezes táron
+    (cache.MatchStatsCache, ezt a prewarm.py is tölti) keresztül.
+    Lezárt meccs (is_match_final: lezárt státusz vagy elmúlt nap) statisztikája nem jár le és a
+    lemezre is kikerül; minden más LIVE_STATS_TTL után újratöltődik és sehol nem tárolódik tartósan.
+    Ha egy forrás hibátlanul válaszolt, de statisztika táblát egyik sem adott, azt is megjegyezzük
+    NO_STATS_TTL-ig (negatív bejegyzés), hogy pl. a prewarm.py körei ne kérjék le újra és újra
+    mindkét részletes URL-t. Hálózati hiba vagy nyitott circuit esetén nincs negatív bejegyzés:
+    a következő hívás újrapróbálja.
+    refresh=True: a memo és a lemezes tár kihagyása (kényszerített újratöltés).
+    """
+    match_id = match.get("match_id")
+    if not match_id:
+        return None, None
+    hit = None if refresh else stats_memo.get(match_id)
+    if hit is not None:
+        metrics.note(cache="hit", layer="memo")
+        return hit
+    final = is_match_final(match)
+    if final and not refresh:
+        stored = match_stats_cache.get(match_id)
+        if stored is not None:
+            import pandas as pd
+
+            table, source = stored
+            metrics.note(cache="hit", layer="disk")
+            result = (normalize_stats_df(pd.DataFrame(table["data"], columns=table["columns"])), source)
+            stats_memo.put(match_id, result)
+            return result
+    metrics.note(cache="miss")
+    answered: List[str] = []
+    stats_df, source = load_match_stats(match_id, speculative=speculative, answered=answered)
+    if stats_df is None:
+        if answered:
+            stats_memo.put(match_id, (None, None), ttl=NO_STATS_TTL)
+    else:
+        stats_memo.put(match_id, (stats_df, source), ttl=None if final else LIVE_STATS_TTL)
+        if final:
+            match_stats_cache.put(match_id, {"columns": [str(c) for c in stats_df.columns],
+                                             "data": stats_df.astype(object).where(stats_df.notna(), None)
+                                                             .values.tolist()}, source)
+            # a lezárt meccsek táblái a típusos történeti tárba is bekerülnek (stats_store.py)
+            player_stats_store.save(match, normalize_stats_df(stats_df))
+    return stats_df, source
+
+
+def prefetch_match_stats(matches: List[Dict], speculative: bool = False,
+                         max_workers: int = PREFETCH_WORKERS,
+                         refresh: bool = False) -> Iterator[Tuple[Dict, Optional[pd.DataFrame]]]:
+    """Az összes meccs statisztikájának párhuzamos betöltése (max_workers egyidejű lekéréssel);
+    (meccs, DataFrame vagy None) párokat ad vissza, ahogy elkészülnek.
+    """
+    def load(m):
+        return get_match_stats(m, speculative=speculative, refresh=refresh)[0]
+
+    for m, stats_df in map_as_completed(load, matches, max_workers=max_workers):
+        yield m, stats_df
+
+
+# -----------------------
+# Élő frissítés: a napi lista újralekérése és diffelése match_id szerint
+# -----------------------
+def match_key(m: Dict):
+    return m.get("match_id") or (m.get("home"), m.get("away"))
+
+
+def match_state(m: Dict) -> tuple:
+    """Az élő frissítésnél figyelt mezők: eredmény és státusz."""
+    return m.get("home_score"), m.get("away_score"), m.get("score_text"), match_status(m)
+
+
+def diff_matches(old: List[Dict], new: List[Dict]) -> List[Dict]:
+    """A new azon meccsei, amelyek újak, vagy eredményük / státuszuk változott az old-hoz képest."""
+    before = {match_key(m): match_state(m) for m in old}
+    return [m for m in new if before.get(match_key(m)) != match_state(m)]
+
+
+def refresh_live_matches(day: date, matches: List[Dict], speculative: bool = False,
+                         max_age: Optional[float] = None,
+                         source: Optional[str] = None) -> Tuple[List[Dict], List[Dict]]:
+    """A napi lista újralekérése (legfeljebb max_age másodperces cache-sel) és a megadott meccsek
+    frissítése helyben (a sorrend marad). Statisztikát csak a változott meccsekhez kérünk újra.
+    source: az eredeti lista forrása (load_daily_matches); ha meg van adva, csak abból frissítünk,
+    különben a JSON / HTML váltásnál a match_key-ek (és a mezők) nem egyeznének.
+    A statisztika memo-t a változott meccseknél ürítjük; a tartós tárba (lemez, stats_store)
+    get_match_stats csak lezárt meccset ír, a már tárolt lezárt táblát pedig nem írja felül.
+    Visszatér: (frissített meccsek, változott meccsek).
+    """
+    fresh, _ = load_daily_matches(day, speculative=speculative, max_age=max_age, only=source)
+    if not fresh:
+        return matches, []
+    by_key = {match_key(m): m for m in fresh}
+    updated = [by_key.get(match_key(m), m) for m in matches]
+    changed = diff_matches(matches, updated)
+    for m in changed:
+        if m.get("match_id"):
+            stats_memo.pop(m["match_id"])
+    for _ in prefetch_match_stats(changed, speculative=speculative):
+        pass
+    return updated, changed
+
+
+@metrics.timed
+def normalize_stats_df(stats_df: pd.DataFrame) -> pd.DataFrame:
+    """A forrásonként eltérő oszlopnevek egységesítése a DISPLAY_COLS magyar(angol) címeire,
+    típusos sémával (build_stats_frame). A parserek már ilyen táblát adnak, azt másolás nélkül
+    visszaadjuk (a memóban tartott táblákat ezért nem módosítjuk helyben).
+    """
+    if has_stats_schema(stats_df):
+        return stats_df
+    import pandas as pd
+    # Ha az oszlopok más nyelven jönnek, próbáljuk normalizálni (kis- és angol címkék)
+    rename_map = {}
+    for c in stats_df.columns:
+        lc = str(c).lower()
+        if lc in ("team", "teamname"):
+            rename_map[c] = "Csapat (Team)"
+        if lc in ("player", "player name", "name"):
+            rename_map[c] = "Játékos (Player)"
+        if "point" in lc or "pts" in lc or re.match(r"^p(ts)?$", lc):
+            rename_map[c] = "Pont (Points)"
+        if "assist" in lc or "ast" in lc:
+            rename_map[c] = "Assziszt (Assists)"
+        if "reb" in lc or "rebound" in lc:
+            rename_map[c] = "Lepattanó (Rebounds)"
+    df = stats_df.rename(columns=rename_map) if rename_map else stats_df
+
+    columns = {}
+    for col in DISPLAY_COLS:
+        if col in df.columns:
+            values = df[col]
+            if isinstance(values, pd.DataFrame):
+                # több forrás oszlop kapta ugyanazt a nevet: az utolsó marad
+                values = values.iloc[:, -1]
+            columns[col] = values.tolist()
+    return build_stats_frame(columns, n_rows=len(df))
+
+
+MATCH_COLS = ["Dátum (Date)", "Mérkőzés (Match)"]
+
+
+def combine_stats(results: List[Tuple[Dict, pd.DataFrame]]) -> pd.DataFrame:
+    """Több meccs statisztikája egy táblában, Dátum és Mérkőzés oszlopokkal kiegészítve."""
+    frames = [normalize_stats_df(stats_df).assign(**{
+        "Dátum (Date)": m.get("date") or "",
+        "Mérkőzés (Match)": f"{m.get('home')} – {m.get('away')}",
+    }) for m, stats_df in results]
+    import pandas as pd
+
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    # eltérő kategóriájú oszlopok összefűzése object-et ad: vissza kategóriára (sok ismétlődő érték)
+    for col in MATCH_COLS + TEXT_COLS:
+        df[col] = df[col].astype("category")
+    return df[MATCH_COLS + DISPLAY_COLS]
+
+
+def score_display(m: Dict) -> str:
+    if m.get("home_score") is not None and m.get("away_score") is not None:
+        return f"{m.get('home_score')} - {m.get('away_score')}"
+    return m.get("score_text") or "?"
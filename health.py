@@ -0,0 +1,167 @@
+"""Forrásonkénti állapotkövetés: sikerességi arány, késleltetés és circuit breaker.
+
+Kulcsok pl. "daily:json", "daily:html", "detail:json", "detail:html".
+Ha egy forrás egymás után FAILURE_THRESHOLD-szor hibázik, a circuit kinyit és a forrást
+COOLDOWN másodpercig kihagyjuk; utána pontosan egy próbahívást engedünk (half-open), ami vagy
+bezárja, vagy azonnal újra kinyitja. A próba alatt a többi hívó továbbra is kihagyja a forrást.
+
+Hibának csak az átviteli hiba számít (kivétel, timeout, nem 200-as válasz): ezt a fetch_*
+függvények a note()-tal jelzik. A "válaszolt, de nincs adat" (pl. statisztika nélküli meccs)
+sikeres hívás. Ha a futás alatt nem volt hálózati kérés (cache találat, vagy egy másik szál
+összevont (coalesced) kérésére vártunk), semmit sem rögzítünk, így a késleltetés is csak a
+valódi hálózati hívásokból áll.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+FAILURE_THRESHOLD = 3
+COOLDOWN = 120.0
+EWMA_ALPHA = 0.3
+
+
+@dataclass
+class SourceStats:
+    calls: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ok_rate: float = 1.0                  # EWMA a sikerességre (0..1)
+    latency: Optional[float] = None       # EWMA késleltetés másodpercben
+    open_until: float = 0.0               # 0 = zárt; > most: nyitott; <= most: half-open
+    probing: bool = False                 # half-open állapotban fut-e már a próbahívás
+
+    def state(self, now: float) -> str:
+        if not self.open_until:
+            return "closed"
+        return "open" if self.open_until > now else "half-open"
+
+    def expected_cost(self) -> float:
+        """Várható "ár": lassú vagy gyakran hibázó forrás drágább."""
+        if self.latency is None:
+            return 0.0
+        return self.latency / max(self.ok_rate, 0.1)
+
+
+class HealthTracker:
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, cooldown: float = COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._stats: Dict[str, SourceStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def record(self, key: str, ok: bool, latency: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(key, SourceStats())
+            stats.probing = False
+            stats.calls += 1
+            stats.ok_rate = EWMA_ALPHA * (1.0 if ok else 0.0) + (1 - EWMA_ALPHA) * stats.ok_rate
+            stats.latency = latency if stats.latency is None else EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * stats.latency
+            if ok:
+                stats.consecutive_failures = 0
+                stats.open_until = 0.0
+            else:
+                stats.failures += 1
+                stats.consecutive_failures += 1
+                if stats.consecutive_failures >= self.failure_threshold:
+                    stats.open_until = time.monotonic() + self.cooldown
+
+    def is_open(self, key: str) -> bool:
+        with self._lock:
+            stats = self._stats.get(key)
+            return stats is not None and stats.open_until > time.monotonic()
+
+    def note(self, ok: bool) -> None:
+        """A track()-kel futtatott forrás jelzi egy hálózati kérés kimenetelét
+        (ok=False: kivétel / timeout / nem 200-as válasz). track()-en kívül hatástalan."""
+        outcomes = getattr(self._local, "outcomes", None)
+        if outcomes is not None:
+            outcomes.append(ok)
+
+    def _admit(self, key: str) -> bool:
+        """Futhat-e most a forrás: zárt circuit igen, nyitott nem, half-open csak az első hívónak."""
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                return True
+            state = stats.state(time.monotonic())
+            if state == "half-open" and not stats.probing:
+                stats.probing = True
+                return True
+            return state == "closed"
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is not None:
+                stats.probing = False
+
+    def track(self, key: str, fn: Callable[[], Any],
+              answered: Optional[List[str]] = None) -> Callable[[], Any]:
+        """fn becsomagolása: ha a circuit engedi, lefuttatja, méri az időt és rögzíti a note()-tal
+        jelzett kimenetelt (a kivétel is hiba); kihagyott forrás vagy kivétel esetén None-t ad.
+        answered: ha meg van adva, ide kerül a kulcs, ha a forrás hibátlanul válaszolt (akár adat
+        nélkül), így a hívó megkülönbözteti a "nincs adat"-ot a hálózati hibától."""
+        def wrapped():
+            if not self._admit(key):
+                return None
+            outcomes: List[bool] = []
+            outer = getattr(self._local, "outcomes", None)
+            self._local.outcomes = outcomes
+            start = time.monotonic()
+            try:
+                result = fn()
+            except Exception:
+                result = None
+                outcomes.append(False)
+            finally:
+                self._local.outcomes = outer
+            if outcomes:
+                self.record(key, all(outcomes), time.monotonic() - start)
+                if answered is not None and all(outcomes):
+                    answered.append(key)
+            else:
+                # nem volt hálózati kérés: se siker, se hiba, se késleltetés minta
+                self._release(key)
+            return result
+        return wrapped
+
+    def arrange(self, kind: str, tasks: Sequence[Tuple[str, Callable[[], Any]]]) -> List[Tuple[str, Callable[[], Any]]]:
+        """A (név, fn) feladatok a várható ár szerint rendezve, a nyitott circuit-ek és a már
+        próbálkozó half-open források nélkül (a próbát maga a track() foglalja le futáskor).
+        Ha minden forrás nyitott, üres listát adunk: a cooldown alatt nem terheljük a forrásokat.
+        """
+        with self._lock:
+            now = time.monotonic()
+            def cost(task):
+                # rendezési kulcs: működő ismert forrás (várható ár szerint) < még nem próbált < hibázó
+                stats = self._stats.get(f"{kind}:{task[0]}")
+                if stats is None:
+                    return 1, 0.0
+                return (0 if stats.consecutive_failures == 0 else 2), stats.expected_cost()
+            def available(task):
+                stats = self._stats.get(f"{kind}:{task[0]}")
+                if stats is None:
+                    return True
+                state = stats.state(now)
+                return state == "closed" or (state == "half-open" and not stats.probing)
+            ordered = sorted(tasks, key=cost)  # stabil: egyenlő árnál marad az eredeti sorrend
+            return [t for t in ordered if available(t)]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Az aktuális állapot táblázatos formában (debug megjelenítéshez)."""
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                "source": key,
+                "calls": stats.calls,
+                "failures": stats.failures,
+                "ok_rate": round(stats.ok_rate, 3),
+                "latency_s": None if stats.latency is None else round(stats.latency, 3),
+                "circuit": stats.state(now),
+            } for key, stats in sorted(self._stats.items())]
+
+
+# Folyamat szintű példány: minden munkamenet és újrafuttatás ugyanazt látja
+source_health = HealthTracker()
@@ -0,0 +1,171 @@
+"""Közös, szálbiztos HTTP kliens az összes Flashscore lekéréshez.
+
+- egyetlen requests.Session, hostonkénti keep-alive connection poollal,
+- korlátos újrapróbálkozás jitteres backoff-fal (csak gyorsan eldőlő hibákra: a connect és
+  read timeoutot nem ismételjük, a Retry-After várakozás RETRY_AFTER_MAX mp-re korlátos),
+- rövid connect timeout (CONNECT_TIMEOUT): egy elérhetetlen host nem viszi el a teljes timeoutot,
+- gzip/deflate (és brotli, ha telepítve van) tömörítés,
+- ETag / Last-Modified alapú revalidáció: 304 esetén a korábbi választ adjuk vissza,
+- hostonkénti token bucket korlát, hogy a közös deploymentből se lépjük túl a tiltási küszöböt.
+
+A requests / urllib3 csak az első kérésnél (get_session) töltődik be.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Optional
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import requests
+    from urllib3.util.retry import Retry
+
+POOL_CONNECTIONS = 4    # ennyi különböző host poolja marad meg
+POOL_MAXSIZE = 16       # egyidejű kapcsolatok hostonként
+MAX_VALIDATORS = 64     # ennyi URL utolsó válaszát tartjuk meg revalidációhoz
+HOST_RATE = 4.0         # tartós kérés/másodperc hostonként
+HOST_BURST = 8          # ennyi kérés mehet ki egyszerre várakozás nélkül
+CONNECT_TIMEOUT = 3.05  # kapcsolódási timeout (mp); a hívó timeout-ja az olvasásra vonatkozik
+RETRY_AFTER_MAX = 3     # legfeljebb ennyi mp-et várunk egy 429 / 503 Retry-After fejlécére
+BACKOFF_MAX = 2.0       # a backoff várakozás felső korlátja (mp)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_validators: "OrderedDict[str, requests.Response]" = OrderedDict()
+_validators_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Klasszikus token bucket: rate token/mp töltődik, legfeljebb burst tárolható."""
+
+    def __init__(self, rate: float = HOST_RATE, burst: int = HOST_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blokkol, amíg egy token elérhető nem lesz."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _bucket_for(url: str) -> TokenBucket:
+    host = urlsplit(url).netloc
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = _buckets[host] = TokenBucket()
+        return bucket
+
+
+def _accept_encoding() -> str:
+    # urllib3 csak akkor tud br-t kicsomagolni, ha a brotli (vagy brotlicffi) telepítve van
+    for mod in ("brotli", "brotlicffi"):
+        try:
+            __import__(mod)
+            return "gzip, deflate, br"
+        except ImportError:
+            continue
+    return "gzip, deflate"
+
+
+def _retry() -> Retry:
+    from urllib3.util.retry import Retry
+
+    kwargs = dict(
+        total=3,
+        # az urllib3 a connect timeoutot is connect hibának számolja: ha ezt ismételnénk, egy
+        # halott feed a (connect) timeout többszörösébe kerülne, ezért kapcsolódást nem ismétlünk
+        connect=0,
+        read=0,  # read timeoutot nem ismétlünk: az a teljes timeoutot újra kifizetné
+        status=2,
+        backoff_factor=0.3,
+        backoff_max=BACKOFF_MAX,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+    )
+    try:
+        return Retry(backoff_jitter=0.3, retry_after_max=RETRY_AFTER_MAX, **kwargs)
+    except TypeError:
+        # régebbi urllib3: nincs retry_after_max (és < 2-ben jitter sem), így a Retry-After
+        # fejlécet nem követjük, különben akár órákig is várhatna egy interaktív hívás
+        kwargs["respect_retry_after_header"] = False
+        try:
+            return Retry(backoff_jitter=0.3, **kwargs)
+        except TypeError:
+            # urllib3 < 2: nincs beépített jitter, a backoff korlát pedig osztály attribútum
+            kwargs.pop("backoff_max")
+            return Retry(**kwargs)
+
+
+def get_session() -> requests.Session:
+    """A megosztott Session (lustán, egyszer jön létre)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS,
+                                      pool_maxsize=POOL_MAXSIZE,
+                                      max_retries=_retry())
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers["Accept-Encoding"] = _accept_encoding()
+                _session = s
+    return _session
+
+
+def get(url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 10) -> requests.Response:
+    """GET a közös Session-nel, feltételes revalidációval.
+
+    timeout: az olvasási timeout; a kapcsolódásra legfeljebb CONNECT_TIMEOUT jut.
+
+    Ha a szerver 304-et ad, a korábban eltárolt (200-as) választ kapjuk vissza,
+    így a hívó számára átlátszó a revalidáció.
+    """
+    hdrs = dict(headers or {})
+    with _validators_lock:
+        cached = _validators.get(url)
+    if cached is not None:
+        etag = cached.headers.get("ETag")
+        last_modified = cached.headers.get("Last-Modified")
+        if etag:
+            hdrs["If-None-Match"] = etag
+        if last_modified:
+            hdrs["If-Modified-Since"] = last_modified
+
+    _bucket_for(url).acquire()
+    r = get_session().get(url, headers=hdrs, timeout=(min(CONNECT_TIMEOUT, timeout), timeout))
+
+    if r.status_code == 304 and cached is not None:
+        with _validators_lock:
+            _validators.move_to_end(url)
+        return cached
+    if r.status_code == 200 and (r.headers.get("ETag") or r.headers.get("Last-Modified")):
+        r.content  # a body beolvasása, hogy a tárolt válasz később is olvasható legyen
+        with _validators_lock:
+            _validators[url] = r
+            _validators.move_to_end(url)
+            while len(_validators) > MAX_VALIDATORS:
+                _validators.popitem(last=False)
+    return r
@@ -0,0 +1,247 @@
+"""Szakaszonkénti mérések a fetch_* / parse_* függvényekhez.
+
+Minden dekorált hívásról egy esemény készül: késleltetés, payload méret, állapot
+(ok / empty / error), HTTP státusz és cache találat / tévesztés (ezeket a függvény maga
+jelzi a note()-tal). Ezen felül a forrásválasztásnál (flashscore.run_sources) rögzítjük,
+melyik forrás nyert (JSON vagy HTML).
+
+Kimenetek:
+- snapshot() / sources(): táblázatos összesítő (p50 / p95 a legutóbbi LATENCY_SAMPLES mérésből),
+  ezt mutatja az app.py debug panelje,
+- prometheus_text() / write_prometheus(): Prometheus szöveges formátum (pl. node_exporter
+  textfile collectorhoz, lásd prewarm.py --metrics-file),
+- JSON log: ha a BASKET_METRICS_LOG környezeti változó meg van adva, minden esemény
+  egy JSON sorként hozzáfűződik a fájlhoz.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+LATENCY_SAMPLES = 1024   # szakaszonként ennyi legutóbbi késleltetésből számolunk percentilist
+QUANTILES = (0.5, 0.95)
+LOG_PATH = os.environ.get("BASKET_METRICS_LOG")
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    latency_sum: float = 0.0
+    payload_bytes: int = 0
+    statuses: Counter = field(default_factory=Counter)     # ok / empty / error
+    http: Counter = field(default_factory=Counter)         # HTTP státuszkódok
+    cache: Counter = field(default_factory=Counter)        # hit / miss
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES))
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _status(result: Any) -> str:
+    if isinstance(result, tuple) and result:
+        # (eredmény, forrás) pár, pl. get_match_stats: az eredmény számít
+        result = result[0]
+    if result is None:
+        return "empty"
+    try:
+        return "ok" if len(result) else "empty"
+    except TypeError:
+        return "ok"
+
+
+def _payload_size(args) -> Optional[int]:
+    """A parse_* függvények első (str / bytes) argumentumának mérete."""
+    if args and isinstance(args[0], (str, bytes)):
+        return len(args[0])
+    return None
+
+
+def _label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    def __init__(self, log_path: Optional[str] = LOG_PATH):
+        self.log_path = log_path
+        self._stages: Dict[str, StageStats] = {}
+        self._wins: Counter = Counter()        # (fajta, forrás) -> nyert
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._log_file = None
+        self._local = threading.local()
+
+    # --- gyűjtés ---
+    def timed(self, fn: Optional[Callable] = None, *, stage: Optional[str] = None) -> Callable:
+        """Dekorátor: a hívás idejét, állapotát és payload méretét rögzíti (a szakasz neve
+        alapértelmezésben a függvény neve). A kivételt továbbengedi."""
+        if fn is None:
+            return lambda f: self.timed(f, stage=stage)
+        name = stage or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            stack = getattr(self._local, "stack", None)
+            if stack is None:
+                stack = self._local.stack = []
+            event = {"stage": name, "bytes": _payload_size(args)}
+            stack.append(event)
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                event["status"] = "error"
+                raise
+            else:
+                event.setdefault("status", _status(result))
+                return result
+            finally:
+                event["latency"] = time.perf_counter() - start
+                stack.pop()
+                self.record(event)
+        return wrapper
+
+    def note(self, **fields: Any) -> None:
+        """Mezők (bytes, http_status, cache, ...) hozzáadása az aktuálisan futó szakasz eseményéhez."""
+        stack = getattr(self._local, "stack", None)
+        if stack:
+            stack[-1].update(fields)
+
+    def record(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            stats = self._stages.setdefault(event["stage"], StageStats())
+            stats.calls += 1
+            stats.latency_sum += event["latency"]
+            stats.samples.append(event["latency"])
+            stats.payload_bytes += event.get("bytes") or 0
+            stats.statuses[event.get("status", "ok")] += 1
+            if event.get("http_status") is not None:
+                stats.http[event["http_status"]] += 1
+            if event.get("cache"):
+                stats.cache[event["cache"]] += 1
+        if self.log_path:
+            self._log(dict(event, ts=round(time.time(), 3), latency=round(event["latency"], 6)))
+
+    def record_source(self, kind: str, source: Optional[str]) -> None:
+        """A forrásválasztás eredménye (source=None: egyik forrás sem adott adatot)."""
+        with self._lock:
+            self._wins[(kind, source or "none")] += 1
+        if self.log_path:
+            self._log({"ts": round(time.time(), 3), "stage": f"source:{kind}", "source": source or "none"})
+
+    def _log(self, event: Dict[str, Any]) -> None:
+        line = json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        with self._log_lock:
+            try:
+                if self._log_file is None:
+                    os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                    self._log_file = open(self.log_path, "a", encoding="utf-8")
+                self._log_file.write(line)
+                self._log_file.flush()
+            except OSError:
+                pass
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._wins.clear()
+
+    # --- összesítők ---
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Szakaszonként: hívások, p50 / p95 / átlag (ms), hibák, üres eredmények, bájtok, cache arány."""
+        rows = []
+        with self._lock:
+            for stage, s in sorted(self._stages.items()):
+                lookups = s.cache["hit"] + s.cache["miss"]
+                rows.append({
+                    "stage": stage,
+                    "calls": s.calls,
+                    "p50_ms": round(s.quantile(0.5) * 1000, 2),
+                    "p95_ms": round(s.quantile(0.95) * 1000, 2),
+                    "mean_ms": round(s.latency_sum / s.calls * 1000, 2),
+                    "errors": s.statuses["error"],
+                    "empty": s.statuses["empty"],
+                    "kib": round(s.payload_bytes / 1024, 1),
+                    "cache_hit_rate": round(s.cache["hit"] / lookups, 3) if lookups else None,
+                    "http": ", ".join(f"{code}: {n}" for code, n in sorted(s.http.items())),
+                })
+        return rows
+
+    def sources(self) -> List[Dict[str, Any]]:
+        """Fajtánként (daily / detail) melyik forrás hányszor nyert és ez mekkora arány."""
+        with self._lock:
+            wins = dict(self._wins)
+        totals = Counter()
+        for (kind, _), n in wins.items():
+            totals[kind] += n
+        return [{"kind": kind, "source": source, "wins": n, "share": round(n / totals[kind], 3)}
+                for (kind, source), n in sorted(wins.items())]
+
+    def to_json(self, health: Optional[List[Dict[str, Any]]] = None) -> str:
+        return json.dumps({"ts": round(time.time(), 3), "stages": self.snapshot(), "sources": self.sources(),
+                           "health": health or []}, ensure_ascii=False, indent=1)
+
+    def prometheus_text(self, health: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Prometheus szöveges expozíciós formátum (health: health.source_health.snapshot())."""
+        lines = [
+            "# HELP basket_stage_duration_seconds Szakasz futási ideje (a legutóbbi mérésekből).",
+            "# TYPE basket_stage_duration_seconds summary",
+        ]
+        with self._lock:
+            stages = sorted(self._stages.items())
+            for stage, s in stages:
+                for q in QUANTILES:
+                    lines.append(f'basket_stage_duration_seconds{{stage="{_label(stage)}",quantile="{q}"}} '
+                                 f"{s.quantile(q):.6f}")
+                lines.append(f'basket_stage_duration_seconds_sum{{stage="{_label(stage)}"}} {s.latency_sum:.6f}')
+                lines.append(f'basket_stage_duration_seconds_count{{stage="{_label(stage)}"}} {s.calls}')
+            lines += ["# HELP basket_stage_calls_total Szakasz hívások állapot szerint (ok / empty / error).",
+                      "# TYPE basket_stage_calls_total counter"]
+            for stage, s in stages:
+                for status, n in sorted(s.statuses.items()):
+                    lines.append(f'basket_stage_calls_total{{stage="{_label(stage)}",status="{status}"}} {n}')
+            lines += ["# HELP basket_stage_payload_bytes_total Feldolgozott / letöltött payload bájtok.",
+                      "# TYPE basket_stage_payload_bytes_total counter"]
+            for stage, s in stages:
+                lines.append(f'basket_stage_payload_bytes_total{{stage="{_label(stage)}"}} {s.payload_bytes}')
+            lines += ["# HELP basket_stage_http_responses_total HTTP válaszok státuszkód szerint.",
+                      "# TYPE basket_stage_http_responses_total counter"]
+            for stage, s in stages:
+                for code, n in sorted(s.http.items()):
+                    lines.append(f'basket_stage_http_responses_total{{stage="{_label(stage)}",code="{code}"}} {n}')
+            lines += ["# HELP basket_stage_cache_total Cache találat / tévesztés szakaszonként.",
+                      "# TYPE basket_stage_cache_total counter"]
+            for stage, s in stages:
+                for result, n in sorted(s.cache.items()):
+                    lines.append(f'basket_stage_cache_total{{stage="{_label(stage)}",result="{_label(result)}"}} {n}')
+            lines += ["# HELP basket_source_wins_total A forrásválasztás nyertese (daily / detail).",
+                      "# TYPE basket_source_wins_total counter"]
+            for (kind, source), n in sorted(self._wins.items()):
+                lines.append(f'basket_source_wins_total{{kind="{_label(kind)}",source="{_label(source)}"}} {n}')
+        if health:
+            lines += ["# HELP basket_source_ok_rate Forrás sikerességi aránya (EWMA).",
+                      "# TYPE basket_source_ok_rate gauge"]
+            lines += [f'basket_source_ok_rate{{source="{_label(h["source"])}"}} {h["ok_rate"]}' for h in health]
+            lines += ["# HELP basket_source_circuit_open Nyitott-e a forrás circuit breakere (1 = kihagyva).",
+                      "# TYPE basket_source_circuit_open gauge"]
+            lines += [f'basket_source_circuit_open{{source="{_label(h["source"])}"}} {int(h["circuit"] == "open")}'
+                      for h in health]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, health: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Atomikus írás (tmp + rename), hogy a collector soha ne lásson félkész fájlt."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text(health))
+        os.replace(tmp, path)
+
+
+# Folyamat szintű példány: minden munkamenet és worker szál ide gyűjt
+metrics = Metrics()
@@ -0,0 +1,102 @@
+"""Párhuzamos futtatási segédek ("első sikeres" spekulatív futtatás, párhuzamos map,
+azonos egyidejű hívások összevonása)."""
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, Sequence, Tuple
+
+def first_successful(tasks: Sequence[Tuple[str, Callable[[], Any]]],
+                     accept: Callable[[Any], bool] = bool,
+                     timeout: Optional[float] = None) -> Tuple[Optional[str], Any]:
+    """Egyszerre elindítja az összes (név, függvény) feladatot, és az első olyan
+    eredményt adja vissza, amire accept() igaz: (név, eredmény).
+
+    Minden hívás saját, rövid életű szálakat kap (feladatonként egyet): a vesztes, még futó
+    feladatokat nem várjuk meg, a háttérben befejeződnek (az eredményük eldobódik), és közben
+    nem foglalnak helyet egy közös poolban, ahol a beágyazott (napok x meccsek x források)
+    párhuzamos lekérések kiéheztetnék egymást. Ha egyik sem sikeres: (None, None).
+    """
+    if not tasks:
+        return None, None
+    pool = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="basket-first")
+    futures = {pool.submit(fn): name for name, fn in tasks}
+    try:
+        for fut in as_completed(futures, timeout=timeout):
+            try:
+                result = fut.result()
+            except Exception:
+                continue
+            if accept(result):
+                return futures[fut], result
+    except FuturesTimeout:
+        pass
+    finally:
+        pool.shutdown(wait=False)
+    return None, None
+
+
+def map_as_completed(fn: Callable[[Any], Any], items: Iterable[Any],
+                     max_workers: int = 4) -> Iterator[Tuple[Any, Any]]:
+    """fn(item) futtatása minden elemre legfeljebb max_workers szálon; (elem, eredmény)
+    párokat ad vissza befejezési sorrendben. Kivétel esetén az eredmény None.
+    Ha a hívó idő előtt abbahagyja az iterálást, a még el nem indult feladatok törlődnek.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="basket-map") as pool:
+        futures = {pool.submit(fn, item): item for item in items}
+        try:
+            for fut in as_completed(futures):
+                try:
+                    result = fut.result()
+                except Exception:
+                    result = None
+                yield futures[fut], result
+        finally:
+            for fut in futures:
+                fut.cancel()
+
+
+class SingleFlight:
+    """Azonos kulcsú, egyszerre futó hívások összevonása: csak az első hívó (leader) futtatja
+    a függvényt, a többiek megvárják és ugyanazt az eredményt (vagy kivételt) kapják.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            fut = self._calls.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._calls[key] = fut
+        if not leader:
+            return fut.result()
+        try:
+            result = fn()
+        except BaseException as exc:
+            fut.set_exception(exc)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+# Folyamat szintű példány: a munkamenetek (és Streamlit újrafuttatások) között közös
+_flights = SingleFlight()
+
+
+def coalesced(fn: Callable) -> Callable:
+    """Dekorátor: az azonos nevű függvény azonos argumentumú, egyidejű hívásai egy hívássá
+    vonódnak össze (a kulcs a függvény neve, így a Streamlit rerun után újradefiniált
+    függvény is ugyanazt a "repülést" használja).
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn.__module__, fn.__qualname__, args, tuple(sorted(kwargs.items())))
+        return _flights.do(key, lambda: fn(*args, **kwargs))
+    return wrapper
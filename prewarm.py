@@ -0,0 +1,82 @@
+"""Háttér előmelegítő: rendszeresen lekéri a mai és holnapi napi listákat, valamint a lezárt
+meccsek statisztikáit, és a helyi tárba (cache.py: DailyCache, MatchStatsCache) írja őket.
+Az app.py ugyanebből a tárból olvas először, így az interaktív keresés ritkán vár a hálózatra.
+
+Streamlit nélkül fut:
+    python prewarm.py                    # folyamatosan, alapértelmezett időközzel
+    python prewarm.py --once --days -1 0 1
+    python prewarm.py --metrics-file /var/lib/node_exporter/basket.prom   # Prometheus textfile
+
+A tár helye a BASKET_CACHE_DIR környezeti változó (alapértelmezés: a modul melletti .basket_cache);
+az app.py-nak ugyanezt kell látnia, hogy az előmelegített adatokat használja.
+"""
+import argparse
+import logging
+import time
+from datetime import date, timedelta
+from typing import Iterable
+
+from cache import TODAY_TTL
+from flashscore import is_match_final, load_daily_matches, prefetch_match_stats
+from health import source_health
+from metrics import metrics
+
+log = logging.getLogger("prewarm")
+
+# A mai lista TTL-je előtt frissítünk, hogy az app soha ne találjon lejárt bejegyzést
+DEFAULT_INTERVAL = TODAY_TTL * 3 // 4
+
+
+def prewarm_once(day_offsets: Iterable[int] = (0, 1), workers: int = 4) -> None:
+    """Egy kör: minden megadott napra friss napi lista + a lezárt meccsek statisztikái.
+
+    Csak a ténylegesen lezárt meccseket (lezárt státusz, vagy elmúlt nap) melegítjük: az élő és
+    a még el sem kezdődött meccsek táblája úgysem kerülhet a végleges tárba. A statisztika nélküli
+    meccseket a get_match_stats negatív bejegyzése (cache.NO_STATS_TTL) védi az ismételt lekéréstől.
+    """
+    today = date.today()
+    for offset in day_offsets:
+        day = today + timedelta(days=offset)
+        start = time.monotonic()
+        matches, source = load_daily_matches(day, max_age=0)
+        finished = [m for m in matches if is_match_final(m) and m.get("match_id")]
+        loaded = sum(1 for _, df in prefetch_match_stats(finished, max_workers=workers) if df is not None)
+        log.info("%s: %d meccs (%s), %d/%d lezárt meccs statisztikája a tárban, %.1fs",
+                 day.isoformat(), len(matches), source or "-", loaded, len(finished),
+                 time.monotonic() - start)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Flashscore napi listák és statisztikák előmelegítése.")
+    parser.add_argument("--days", type=int, nargs="+", default=[0, 1],
+                        help="napok eltolása a mai naphoz képest (alapértelmezés: 0 1 = ma és holnap)")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help=f"körök közötti idő másodpercben (alapértelmezés: {DEFAULT_INTERVAL})")
+    parser.add_argument("--workers", type=int, default=4, help="párhuzamos statisztika lekérések száma")
+    parser.add_argument("--once", action="store_true", help="csak egy kör, utána kilép")
+    parser.add_argument("--metrics-file", default=None,
+                        help="minden kör után ide írja a méréseket Prometheus szöveges formátumban")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        while True:
+            started = time.monotonic()
+            try:
+                prewarm_once(args.days, workers=args.workers)
+            except Exception:
+                log.exception("előmelegítési kör sikertelen")
+            if args.metrics_file:
+                try:
+                    metrics.write_prometheus(args.metrics_file, source_health.snapshot())
+                except OSError:
+                    log.exception("a mérések kiírása sikertelen")
+            if args.once:
+                return 0
+            time.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
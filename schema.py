@@ -0,0 +1,80 @@
+"""Tanult JSON útvonalak a Flashscore feedekhez.
+
+A feedek szerkezete nem dokumentált, ezért az első payloadnál keresünk (korai kilépéses,
+iteratív bejárással), és megjegyezzük a kulcs-útvonalat, ahol a keresett lista volt.
+A későbbi payloadoknál először közvetlenül ezt az útvonalat próbáljuk (O(útvonal hossza)),
+és csak akkor keresünk újra, ha az útvonal nem vezet érvényes adathoz.
+"""
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+Path = Tuple[Union[str, int], ...]
+
+
+def resolve(obj: Any, path: Path) -> Any:
+    """Az útvonal követése dict kulcsokon / lista indexeken; hiány esetén None."""
+    for step in path:
+        if isinstance(obj, dict):
+            if step not in obj:
+                return None
+            obj = obj[step]
+        elif isinstance(obj, list) and isinstance(step, int):
+            if not -len(obj) <= step < len(obj):
+                return None
+            obj = obj[step]
+        else:
+            return None
+    return obj
+
+
+def find_first_list(obj: Any, predicate: Callable[[list], bool]) -> Optional[Tuple[Path, list]]:
+    """Az első lista (mélységi bejárás, dokumentum sorrendben), amire predicate igaz.
+
+    Az egyező listába nem lépünk bele; a nem egyező listák elemeit és a dict értékeit bejárjuk.
+    Iteratív (explicit veremmel), és az első találatnál azonnal visszatér.
+    """
+    stack = [((), obj)]
+    while stack:
+        path, node = stack.pop()
+        if isinstance(node, dict):
+            children = [(path + (k,), v) for k, v in node.items()]
+        elif isinstance(node, list):
+            if predicate(node):
+                return path, node
+            children = [(path + (i,), v) for i, v in enumerate(node)]
+        else:
+            continue
+        # fordított sorrendben a verembe, hogy az eredeti sorrendben jöjjenek ki
+        stack.extend(reversed(children))
+    return None
+
+
+class SchemaMemo:
+    """Fajtánként ("daily_events", "detail_players" stb.) megjegyzett útvonalak, szálbiztosan."""
+
+    def __init__(self):
+        self._paths: Dict[str, Path] = {}
+        self._lock = threading.Lock()
+
+    def path(self, kind: str) -> Optional[Path]:
+        with self._lock:
+            return self._paths.get(kind)
+
+    def lookup(self, kind: str, data: Any, valid: Callable[[Any], bool],
+               search: Callable[[Any], Optional[Tuple[Path, Any]]]) -> Any:
+        """Először a tanult útvonal; ha az nem ad valid() értéket, search() és tanulás."""
+        path = self.path(kind)
+        if path is not None:
+            value = resolve(data, path)
+            if valid(value):
+                return value
+        hit = search(data)
+        if hit is None:
+            return None
+        with self._lock:
+            self._paths[kind] = hit[0]
+        return hit[1]
+
+
+# Folyamat szintű példány
+schema_memo = SchemaMemo()
@@ -0,0 +1,189 @@
+"""Helyi, típusos játékosstatisztika tár (SQLite) és vektorizált pandas aggregációk.
+
+Minden lezárt meccs statisztika táblája ide kerül (match_id, dátum, csapat, játékos kulccsal,
+egész típusú stat oszlopokkal), így a szezon szintű kérdések (játékos átlagok, csapat
+összesítők, utolsó N meccs formája) újra-scrapelés nélkül, helyi adatból válaszolhatók meg.
+A pandas csak az első mentéskor / lekérdezéskor töltődik be.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, Optional
+
+from cache import CACHE_DIR
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# megjelenítési oszlop -> tár oszlop
+COLUMN_MAP = {
+    "Csapat (Team)": "team",
+    "Játékos (Player)": "player",
+    "Pont (Points)": "points",
+    "Assziszt (Assists)": "assists",
+    "Lepattanó (Rebounds)": "rebounds",
+}
+STAT_COLUMNS = ["points", "assists", "rebounds"]
+
+
+class PlayerStatsStore:
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS player_stats ("
+        " match_id TEXT NOT NULL,"
+        " date TEXT,"
+        " home TEXT,"
+        " away TEXT,"
+        " team TEXT NOT NULL,"
+        " player TEXT NOT NULL,"
+        " points INTEGER,"
+        " assists INTEGER,"
+        " rebounds INTEGER,"
+        " PRIMARY KEY (match_id, team, player))",
+        "CREATE INDEX IF NOT EXISTS player_stats_player ON player_stats (player)",
+        "CREATE INDEX IF NOT EXISTS player_stats_team ON player_stats (team)",
+        "CREATE INDEX IF NOT EXISTS player_stats_date ON player_stats (date)",
+    ]
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(CACHE_DIR, "player_stats.sqlite3")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            for stmt in self.SCHEMA:
+                conn.execute(stmt)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save(self, match: Dict, stats_df: pd.DataFrame) -> int:
+        """Egy meccs (DISPLAY_COLS oszlopos) statisztika táblájának mentése / felülírása.
+        A meccs korábbi sorai ugyanabban a tranzakcióban törlődnek, így egy másik forrásból
+        (JSON: team "A" / HTML: team "") jött tábla sem duplikálja a játékosokat.
+        Visszatér a mentett sorok számával."""
+        import pandas as pd
+
+        df = stats_df.rename(columns=COLUMN_MAP)
+        if "player" not in df.columns or not match.get("match_id"):
+            return 0
+        df = df[[c for c in COLUMN_MAP.values() if c in df.columns]].copy()
+        for col in STAT_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64") if col in df.columns else pd.NA
+        for col in ("team", "player"):
+            if col in df.columns:
+                df[col] = df[col].astype(object)  # a kategória oszlopba nem írható új érték ("")
+        df["team"] = df["team"].where(df["team"].notna() & (df["team"] != "?"), "") if "team" in df.columns else ""
+        df = df[df["player"].notna() & (df["player"] != "?")]
+        rows = [
+            (match["match_id"], match.get("date"), match.get("home"), match.get("away"), str(team), str(player),
+             *(None if pd.isna(v) else int(v) for v in stats))
+            for team, player, *stats in df[["team", "player"] + STAT_COLUMNS].itertuples(index=False, name=None)
+        ]
+        if not rows:
+            return 0
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM player_stats WHERE match_id = ?", (match["match_id"],))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO player_stats"
+                    " (match_id, date, home, away, team, player, points, assists, rebounds)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error:
+            return 0
+        return len(rows)
+
+    def load(self, team: Optional[str] = None, player: Optional[str] = None,
+             since: Optional[str] = None, until: Optional[str] = None,
+             match_team: Optional[str] = None) -> pd.DataFrame:
+        """Típusos DataFrame (dátum: datetime64, statok: Int64, csapat/játékos: category).
+        A szűrések kisbetű-független részsztring egyezések: team a játékos csapatára,
+        match_team a meccs két csapatára (home / away) szűr, így az ellenfél sorait is adja."""
+        import pandas as pd
+
+        where, params = [], []
+        if team:
+            where.append("lower(team) LIKE ?")
+            params.append(f"%{team.lower()}%")
+        if match_team:
+            where.append("(lower(home) LIKE ? OR lower(away) LIKE ?)")
+            params += [f"%{match_team.lower()}%"] * 2
+        if player:
+            where.append("lower(player) LIKE ?")
+            params.append(f"%{player.lower()}%")
+        if since:
+            where.append("date >= ?")
+            params.append(since)
+        if until:
+            where.append("date <= ?")
+            params.append(until)
+        sql = "SELECT * FROM player_stats" + (" WHERE " + " AND ".join(where) if where else "")
+        try:
+            with self._connect() as conn:
+                df = pd.read_sql_query(sql, conn, params=params)
+        except (sqlite3.Error, pd.errors.DatabaseError):
+            df = pd.DataFrame(columns=["match_id", "date", "home", "away", "team", "player"] + STAT_COLUMNS)
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
+        for col in STAT_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        for col in ("team", "player"):
+            df[col] = df[col].astype("category")
+        return df
+
+
+# -----------------------
+# Vektorizált aggregációk (a load() eredményén)
+# -----------------------
+def player_averages(df: pd.DataFrame) -> pd.DataFrame:
+    """Játékosonként: meccsszám és meccsenkénti átlagok, pont szerint csökkenő sorrendben."""
+    import pandas as pd
+
+    if df.empty:
+        return pd.DataFrame(columns=["player", "team", "games"] + STAT_COLUMNS)
+    out = (df.groupby(["player", "team"], observed=True)
+             .agg(games=("match_id", "nunique"), **{c: (c, "mean") for c in STAT_COLUMNS})
+             .reset_index())
+    out[STAT_COLUMNS] = out[STAT_COLUMNS].astype("Float64").round(1)
+    return out.sort_values("points", ascending=False, na_position="last").reset_index(drop=True)
+
+
+def team_totals(df: pd.DataFrame) -> pd.DataFrame:
+    """Csapatonként: meccsszám, összesen és meccsenkénti átlag (a játékos sorok összegéből)."""
+    import pandas as pd
+
+    if df.empty:
+        return pd.DataFrame(columns=["team", "games"] + STAT_COLUMNS + [f"{c}_per_game" for c in STAT_COLUMNS])
+    per_match = df.groupby(["team", "match_id"], observed=True)[STAT_COLUMNS].sum(min_count=1)
+    by_team = per_match.groupby(level="team", observed=True)
+    sums, means = by_team.sum(min_count=1), by_team.mean()
+    result = pd.DataFrame({"games": by_team.size()})
+    for c in STAT_COLUMNS:
+        result[c] = sums[c]
+        result[f"{c}_per_game"] = means[c].astype("Float64").round(1)
+    return result.reset_index().sort_values("points", ascending=False).reset_index(drop=True)
+
+
+def last_n_form(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
+    """Játékosonként az utolsó n meccs átlaga és a teljes átlagtól való eltérése (forma)."""
+    import pandas as pd
+
+    if df.empty:
+        return pd.DataFrame(columns=["player", "team", "games"] + STAT_COLUMNS + ["points_diff"])
+    ordered = df.sort_values("date")
+    recent = ordered.groupby("player", observed=True).tail(n)
+    form = player_averages(recent)
+    overall = player_averages(df).set_index(["player", "team"])["points"]
+    keys = pd.MultiIndex.from_frame(form[["player", "team"]])
+    form["points_diff"] = (form["points"] - pd.Series(overall.reindex(keys).to_numpy(), index=form.index)).round(1)
+    return form
+
+
+# Folyamat szintű példány
+player_stats_store = PlayerStatsStore()
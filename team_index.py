@@ -0,0 +1,164 @@
+"""Csapatnév index: ékezet- és kisbetű-független, toleráns (fuzzy) keresés.
+
+- normalize(): NFKD + ékezetek elhagyása + casefold ("München" -> "munchen"),
+- trigram inverted index: a jelölteket a közös trigramok alapján keressük, nem lineárisan,
+- alias tábla: beépített rövidítések + a korábbi találatokból tanult aliasok (JSON fájlban),
+  így az index napok és munkamenetek között is újrahasznosítható.
+"""
+import json
+import os
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from cache import CACHE_DIR
+
+FUZZY_THRESHOLD = 0.6   # a lekérdezés trigramjainak legalább ekkora része kell egyezzen
+ALIAS_SCORE = 0.95
+SUBSTRING_SCORE = 0.9
+
+# Gyakori rövidítések / más írásmódok -> normalizált keresőszöveg
+BUILTIN_ALIASES = {
+    "fcb": "bayern",
+    "barca": "barcelona",
+    "red star": "crvena zvezda",
+    "zvezda": "crvena zvezda",
+    "olympiakos": "olympiacos",
+    "pao": "panathinaikos",
+    "efes": "anadolu efes",
+    "fener": "fenerbahce",
+    "maccabi": "maccabi tel aviv",
+    "real": "real madrid",
+    "alba": "alba berlin",
+    "fradi": "ferencvaros",
+}
+
+
+@lru_cache(maxsize=8192)
+def normalize(name: str) -> str:
+    """Ékezetmentes, kisbetűs, csak betű/szám + szóköz alak."""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    folded = "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+    return " ".join(re.sub(r"[^\w]+", " ", folded).split())
+
+
+def trigrams(text: str, pad: bool = True) -> Set[str]:
+    if pad:
+        text = f" {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TeamIndex:
+    def __init__(self, alias_path: Optional[str] = None):
+        self.alias_path = alias_path or os.path.join(CACHE_DIR, "team_aliases.json")
+        self._display: Dict[str, str] = {}          # normalizált név -> eredeti megjelenítési név
+        self._grams: Dict[str, Set[str]] = {}       # trigram -> normalizált nevek
+        self._learned: Dict[str, str] = {}          # normalizált lekérdezés -> normalizált csapatnév
+        self._lock = threading.Lock()
+        self._load_aliases()
+
+    # --- index építés ---
+    def add(self, name: Optional[str]) -> None:
+        key = normalize(name or "")
+        if not key or key in self._display:
+            return
+        with self._lock:
+            self._display[key] = name
+            for g in trigrams(key) | trigrams(key, pad=False):
+                self._grams.setdefault(g, set()).add(key)
+
+    def add_matches(self, matches: Iterable[Dict]) -> None:
+        for m in matches:
+            self.add(m.get("home"))
+            self.add(m.get("away"))
+
+    # --- keresés ---
+    def _search_normalized(self, q: str) -> Dict[str, float]:
+        """Normalizált lekérdezés -> {normalizált név: pontszám}."""
+        if not q:
+            return {}
+        with self._lock:
+            if len(q) < 3:
+                # túl rövid a trigramokhoz: a (kevés) különböző néven egyszerű részsztring keresés
+                return {k: SUBSTRING_SCORE for k in self._display if q in k}
+            scores: Dict[str, float] = {}
+            # 1) részsztring: a q minden (nem paddelt) trigramja benne kell legyen a névben
+            exact_grams = trigrams(q, pad=False)
+            postings = sorted((self._grams.get(g, set()) for g in exact_grams), key=len)
+            if postings and postings[0]:
+                candidates = set.intersection(*postings)
+                for k in candidates:
+                    if q == k:
+                        scores[k] = 1.0
+                    elif q in k:
+                        scores[k] = SUBSTRING_SCORE
+            # 2) toleráns egyezés: a lekérdezés trigramjainak hányada található meg a névben
+            q_grams = trigrams(q)
+            counts: Dict[str, int] = {}
+            for g in q_grams:
+                for k in self._grams.get(g, ()):
+                    counts[k] = counts.get(k, 0) + 1
+            for k, c in counts.items():
+                score = c / len(q_grams)
+                if score >= FUZZY_THRESHOLD and k not in scores:
+                    scores[k] = round(score * 0.8, 3)
+            return scores
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Rangsorolt jelöltek: [(normalizált név, pontszám)], a legjobb elöl."""
+        q = normalize(query)
+        scores = self._search_normalized(q)
+        alias = self._learned.get(q) or BUILTIN_ALIASES.get(q)
+        if alias:
+            for k, score in self._search_normalized(alias).items():
+                scores[k] = max(scores.get(k, 0.0), min(score, ALIAS_SCORE))
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        return ranked[:limit] if limit else ranked
+
+    def display_name(self, key: str) -> str:
+        return self._display.get(key, key)
+
+    # --- alias tanulás ---
+    def learn(self, query: str, team_name: str) -> None:
+        """Megjegyzi, hogy a lekérdezés ehhez a csapathoz vezetett (ha nem triviális egyezés)."""
+        q, team = normalize(query), normalize(team_name)
+        if not q or not team or q in team or self._learned.get(q) == team:
+            return
+        with self._lock:
+            self._learned[q] = team
+        self._save_aliases()
+
+    def learn_from_match(self, query: str, match: Dict) -> None:
+        """A meccs két csapata közül a lekérdezéshez jobban illeszkedőt tanulja meg."""
+        scores = dict(self.search(query))
+        sides = [match.get("home") or "", match.get("away") or ""]
+        best = max(sides, key=lambda n: scores.get(normalize(n), 0.0))
+        if scores.get(normalize(best), 0.0) > 0:
+            self.learn(query, best)
+
+    def _load_aliases(self) -> None:
+        try:
+            with open(self.alias_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._learned.update({str(k): str(v) for k, v in data.items()})
+        except (OSError, ValueError):
+            pass
+
+    def _save_aliases(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.alias_path) or ".", exist_ok=True)
+            with self._lock:
+                data = dict(self._learned)
+            tmp = self.alias_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(tmp, self.alias_path)
+        except OSError:
+            pass
+
+
+# Folyamat szintű index: minden lekért nap csapatai ide kerülnek
+team_index = TeamIndex()